@@ -0,0 +1,49 @@
+"""
+Benchmark: tag string parser
+
+Times ``tagulous.utils.parse_tags`` on quoted tag strings from 100 bytes to
+1 MB, to show that parse time scales linearly with input length.
+
+Usage::
+
+    python benchmarks/parse_tags.py
+"""
+import os
+import sys
+import timeit
+
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from django.conf import settings  # noqa: E402
+
+
+settings.configure()
+
+from tagulous.utils import parse_tags  # noqa: E402
+
+
+SIZES = [100, 1_000, 10_000, 100_000, 1_000_000]
+
+# A mix of quoted names with commas, escaped quotes and plain names
+CHUNK = '"tag, one", "escaped ""quote""", plain tag, '
+
+
+def build(size):
+    return (CHUNK * (size // len(CHUNK) + 1))[:size]
+
+
+def main():
+    print("%10s %12s %14s" % ("bytes", "seconds", "us per KB"))
+    for size in SIZES:
+        tag_string = build(size)
+        number = max(1, 100_000 // size)
+        seconds = min(
+            timeit.repeat(lambda: parse_tags(tag_string), number=number, repeat=3)
+        )
+        seconds /= number
+        print("%10d %12.6f %14.1f" % (size, seconds, seconds / size * 1_000_000_000))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Benchmark: TagField manager creation
+
+Times the first access of a ``TagField`` on 10,000 saved instances, which
+creates a ``TagRelatedManager`` for each instance. Runs once with the manager
+class cache, and once with the cache cleared before each access to show the
+cost of building a new class for each instance.
+
+Usage::
+
+    python benchmarks/tag_managers.py
+"""
+import gc
+import os
+import sys
+import time
+
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import django  # noqa: E402
+from django.conf import settings  # noqa: E402
+
+
+settings.configure(
+    INSTALLED_APPS=[
+        "django.contrib.contenttypes",
+        "tagulous",
+        "tests.tagulous_tests_app",
+    ],
+    DATABASES={
+        "default": {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"}
+    },
+)
+django.setup()
+
+from tests.tagulous_tests_app.models import SimpleMixedTest  # noqa: E402
+
+
+COUNT = 10_000
+
+
+def run(cached):
+    descriptor = SimpleMixedTest.tags
+    # Instances with a pk use the real manager; no database access is needed
+    instances = [SimpleMixedTest(pk=i + 1, name="Test") for i in range(COUNT)]
+    classes = set()
+
+    gc.collect()
+    start = time.perf_counter()
+    for instance in instances:
+        if not cached:
+            descriptor.manager_classes.clear()
+        classes.add(type(instance.tags))
+    seconds = time.perf_counter() - start
+    return seconds, len(classes)
+
+
+def main():
+    print("%10s %12s %16s %10s" % ("cache", "seconds", "us per instance", "classes"))
+    for cached in (False, True):
+        seconds, classes = run(cached)
+        print(
+            "%10s %12.4f %16.2f %10d"
+            % (
+                "on" if cached else "off",
+                seconds,
+                seconds / COUNT * 1_000_000,
+                classes,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,13 @@ MODEL_PREFIX = "Tagulous"
 # %s will be replaced by the field name
 TAGGED_ATTR_MANAGER = "_%s_tagulous"
 
+# Attribute on the tagged model's _meta for the list of its tag fields
+TAGGED_ATTR_FIELDS = "tagulous_fields"
+
+# Attribute set on tagged model instances being deleted by a TaggedQuerySet,
+# once their tag counts have been changed
+TAGGED_ATTR_DELETED = "_tagulous_deleted"
+
 # Constants to improve code legibility
 COMMA = ","
 SPACE = " "
@@ -35,6 +42,7 @@ OPTION_DEFAULTS = {
     "get_absolute_url": None,
     "verbose_name_singular": None,
     "verbose_name_plural": None,
+    "count_shards": 0,
 }
 
 # List of model TagField options which are relevant to form fields
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from ...models.counts import gc_tag_model, get_tag_models
+
+
+class Command(BaseCommand):
+    """
+    Delete unused tags
+    Optional argument allows you to specify what to clean up
+    If field_name is missing, clean up tag models for all tag fields on the model
+    If model_name is missing, clean up tag models for all models in the app
+    If app_name is missing, clean up all tag models in all apps
+    """
+
+    help = "Delete unused tags"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--target",
+            type=str,
+            default="",
+            help="Target to clean up: [<app_name>[.<model_name>[.<field_name>]]]",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1000,
+            help="Number of tags to delete in each query",
+        )
+
+    def handle(self, target="", chunk_size=1000, **options):
+        for tag_model in get_tag_models(target):
+            gc_tag_model(tag_model, chunk_size=chunk_size, report=self.stdout)
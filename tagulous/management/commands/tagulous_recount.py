@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+
+from ...models.counts import get_tag_models, recount_tag_model
+
+
+class Command(BaseCommand):
+    """
+    Recalculate tag counts
+    Optional argument allows you to specify what to recount
+    If field_name is missing, recount tag models for all tag fields on the model
+    If model_name is missing, recount tag models for all models in the app
+    If app_name is missing, recount all tag models in all apps
+    """
+
+    help = "Recalculate tag counts"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--target",
+            type=str,
+            default="",
+            help="Target to recount: [<app_name>[.<model_name>[.<field_name>]]]",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1000,
+            help="Number of tags to check and update in each query",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            default=False,
+            help="Report wrong counts without changing them",
+        )
+
+    def handle(self, target="", chunk_size=1000, dry_run=False, **options):
+        for tag_model in get_tag_models(target):
+            recount_tag_model(
+                tag_model, chunk_size=chunk_size, dry_run=dry_run, report=self.stdout
+            )
@@ -0,0 +1,393 @@
+"""
+Tag count management
+
+When ``TAGULOUS_DEFER_COUNTS`` is enabled, changes to tag counts made inside a
+transaction are collected in a buffer, and applied together when the
+transaction is committed.
+
+Counts can be recalculated in bulk with ``recount_tag_model``, and unused tags
+deleted in bulk with ``gc_tag_model``, used by the management commands
+``tagulous_recount`` and ``tagulous_gc``.
+"""
+import weakref
+
+from django.apps import apps
+from django.core.exceptions import FieldDoesNotExist
+from django.core.management.base import CommandError
+from django.db import connections, router, transaction
+from django.db.models import Count
+
+from .. import settings
+
+
+def can_update_returning(connection):
+    """
+    Return True if the database connection supports ``UPDATE ... RETURNING``
+
+    PostgreSQL and SQLite 3.35+ support it with the same syntax as
+    ``INSERT ... RETURNING``, so use Django's feature flag for that. MySQL and
+    MariaDB do not support it, and Oracle uses a different syntax.
+    """
+    if connection.vendor not in ("postgresql", "sqlite"):
+        return False
+    return bool(getattr(connection.features, "can_return_columns_from_insert", False))
+
+
+class CountBuffer(object):
+    """
+    Collect tag count changes for an atomic block, to apply when the
+    transaction is committed
+
+    The buffer is registered with ``transaction.on_commit``, so if the atomic
+    block is rolled back Django will discard it along with its changes.
+    """
+
+    def __init__(self, using, savepoints):
+        self.using = using
+        # Savepoints which would discard the buffer if rolled back
+        self.savepoints = savepoints
+        # Changes by tag model, as ``{tag_model: {pk: amount}}``
+        self.amounts = {}
+
+    def add(self, tag_model, amounts):
+        """
+        Add a dict of ``{pk: amount}`` changes for the tag model
+        """
+        model_amounts = self.amounts.setdefault(tag_model, {})
+        for pk, amount in amounts.items():
+            model_amounts[pk] = model_amounts.get(pk, 0) + amount
+
+    def merge(self, other):
+        """
+        Move the changes from another buffer into this one
+        """
+        for tag_model, amounts in other.amounts.items():
+            self.add(tag_model, amounts)
+        other.amounts = {}
+
+    def flush(self):
+        """
+        Apply the changes, with one update query per tag model, then delete any
+        tags which are no longer in use (unless ``TAGULOUS_DELETE_INLINE`` is
+        ``False``)
+        """
+        amounts, self.amounts = self.amounts, {}
+        for tag_model, model_amounts in amounts.items():
+            qs = tag_model.objects.using(self.using)
+            pks = qs._update_counts(model_amounts)
+            if settings.DELETE_INLINE:
+                qs.filter(pk__in=pks).delete_unused()
+
+    def __call__(self):
+        # Called by Django when the transaction is committed
+        _buffers.get(connections[self.using], set()).discard(self)
+        self.flush()
+
+
+# Buffers waiting for their transaction to commit, as ``{connection: WeakSet}``
+#
+# If an atomic block a buffer was registered in is rolled back, Django drops it
+# from its on_commit list, so buffers are checked against that list before
+# they are used.
+_buffers = weakref.WeakKeyDictionary()
+
+
+def _get_queued(connection):
+    """
+    Return the set of buffers which Django will still call on commit
+    """
+    # Callbacks are stored in tuples, whose layout varies between versions
+    return set(
+        item
+        for entry in connection.run_on_commit
+        for item in entry
+        if isinstance(item, CountBuffer)
+    )
+
+
+def defer(tag_model, using, amounts):
+    """
+    Add a dict of ``{pk: amount}`` count changes for the tag model to the
+    buffer for the current atomic block on the specified database
+
+    Returns True if the changes have been deferred, or False if there is no
+    transaction to defer them to.
+    """
+    connection = connections[using]
+    if not connection.in_atomic_block:
+        return False
+
+    # Savepoints which have been released can no longer be rolled back, so
+    # buffers which share the same active savepoints share the same fate, and
+    # can be merged together.
+    active = frozenset(sid for sid in connection.savepoint_ids if sid)
+    registered = _buffers.setdefault(connection, weakref.WeakSet())
+    queued = _get_queued(connection) if registered else set()
+    by_fate = {}
+    for buffer in list(registered):
+        if buffer not in queued:
+            # Discarded by a rollback
+            registered.discard(buffer)
+            continue
+
+        buffer.savepoints &= active
+        if buffer.savepoints in by_fate:
+            by_fate[buffer.savepoints].merge(buffer)
+            registered.discard(buffer)
+        else:
+            by_fate[buffer.savepoints] = buffer
+
+    # Use the buffer which will be discarded if any active savepoint is
+    # rolled back, otherwise register a new one
+    buffer = by_fate.get(active)
+    if buffer is None:
+        buffer = CountBuffer(using, active)
+        registered.add(buffer)
+        transaction.on_commit(buffer, using=using)
+
+    buffer.add(tag_model, amounts)
+    return True
+
+
+def apply_bulk(tag_model, using, amounts):
+    """
+    Apply a dict of ``{pk: amount}`` count changes for the tag model with one
+    update query, then delete any tags which are no longer in use in bulk
+
+    For bulk operations, where many tags may be left unused at once. Unlike
+    ``change_counts``, tag instances are not updated. The changes will be
+    deferred if ``TAGULOUS_DEFER_COUNTS`` is enabled and there is a transaction.
+    """
+    amounts = {pk: amount for pk, amount in amounts.items() if amount}
+    if not amounts:
+        return
+    if settings.DEFER_COUNTS and defer(tag_model, using, amounts):
+        return
+    buffer = CountBuffer(using, frozenset())
+    buffer.add(tag_model, amounts)
+    buffer.flush()
+
+
+#
+# Functions to recount tags and delete unused tags
+# Used by the management commands `tagulous_recount` and `tagulous_gc`
+#
+
+
+def get_tag_models(target=""):
+    """
+    Find the tag models for a management command target
+
+    Arguments:
+        target      Target, in the form ``[<app>[.<model>[.<field>]]]``
+                    If field is missing, use tag models for all tag fields on
+                    the model. If model is missing, use all tag models in the
+                    app. If app is missing, use all tag models in all apps.
+
+    Returns a list of tag models, each only listed once. Raises a
+    ``CommandError`` if the target is not valid.
+    """
+    from .fields import (
+        SingleTagField,
+        TagField,
+        singletagfields_from_model,
+        tagfields_from_model,
+    )
+    from .models import BaseTagModel
+
+    # Split up target argument
+    parts = target.split(".") if target else []
+    if len(parts) > 3:
+        raise CommandError(
+            "Invalid target %r: expected [<app>[.<model>[.<field>]]]" % target
+        )
+    app_name, model_name, field_name = parts + ([None] * (3 - len(parts)))
+
+    # Look up app
+    if app_name:
+        try:
+            app = apps.get_app_config(app_name)
+        except LookupError as e:
+            raise CommandError(e)
+    else:
+        app = None
+
+    # Look up specific model, or get all models for the app
+    if model_name:
+        try:
+            models = [app.get_model(model_name)]
+        except LookupError as e:
+            raise CommandError(e)
+    elif app is None:
+        # Get all models for all apps
+        models = apps.get_models()
+    else:
+        models = app.get_models()
+
+    # Find the tag models
+    if field_name:
+        model = models[0]
+        try:
+            field = model._meta.get_field(field_name)
+        except FieldDoesNotExist as e:
+            raise CommandError(e)
+        if not isinstance(field, (SingleTagField, TagField)):
+            raise CommandError(
+                "%s.%s.%s is not a SingleTagField or TagField"
+                % (model._meta.app_label, model.__name__, field_name)
+            )
+        found = [field.remote_field.model]
+    else:
+        found = []
+        for model in models:
+            if issubclass(model, BaseTagModel):
+                found.append(model)
+            fields = singletagfields_from_model(model) + tagfields_from_model(model)
+            found.extend(field.remote_field.model for field in fields)
+
+    tag_models = []
+    for tag_model in found:
+        if tag_model not in tag_models:
+            tag_models.append(tag_model)
+    return tag_models
+
+
+def get_related_counts(tag_model, using=None):
+    """
+    Count how many times SingleTagFields and TagFields refer to each tag, using
+    one aggregate query for each related field
+
+    Returns a dict of ``{pk: count}``; tags which are not used are not included.
+    """
+    using = using or router.db_for_write(tag_model)
+    counts = {}
+    for related in tag_model.get_related_fields():
+        field = related.field
+        if field.many_to_many:
+            # Count the rows in the through table
+            ref_name = field.m2m_reverse_field_name()
+            qs = field.remote_field.through._base_manager
+        else:
+            ref_name = field.attname
+            qs = related.related_model._base_manager.filter(
+                **{"%s__isnull" % ref_name: False}
+            )
+
+        rows = (
+            qs.using(using)
+            .order_by()
+            .values(ref_name)
+            .annotate(count=Count("pk"))
+            .values_list(ref_name, "count")
+        )
+        for pk, count in rows:
+            counts[pk] = counts.get(pk, 0) + count
+    return counts
+
+
+def recount_tag_model(tag_model, chunk_size=1000, dry_run=False, report=None):
+    """
+    Recalculate the counts for all tags in the tag model
+
+    If the tag model has count shards, they will be folded into the tag counts
+    first.
+
+    You will not normally need to call this directly - instead use the
+    management command ``tagulous_recount``.
+
+    Arguments:
+        tag_model   Tag model to recount
+        chunk_size  Number of tags to check and update in each query
+        dry_run     If True, report the counts which are wrong without
+                    changing them
+        report      Optional: a file handle to write verbose reports to
+
+    Returns the number of tags whose counts were wrong.
+    """
+    using = router.db_for_write(tag_model)
+    sharded = tag_model.count_shard_model is not None
+    if sharded and not dry_run:
+        tag_model.objects.using(using).fold_count_shards()
+
+    counts = get_related_counts(tag_model, using=using)
+    qs = tag_model._base_manager.using(using).order_by("pk")
+
+    changed = 0
+    last_pk = None
+    while True:
+        chunk_qs = qs if last_pk is None else qs.filter(pk__gt=last_pk)
+        chunk = list(chunk_qs.values_list("pk", "name", "count")[:chunk_size])
+        if not chunk:
+            break
+        last_pk = chunk[-1][0]
+        if sharded and dry_run:
+            # Shards have not been folded, so include them in the counts
+            shard_counts = (
+                tag_model.objects.using(using)
+                .filter(pk__in=[pk for pk, name, count in chunk])
+                .get_counts()
+            )
+            chunk = [
+                (pk, name, shard_counts.get(pk, count)) for pk, name, count in chunk
+            ]
+
+        # Find tags whose counts are wrong
+        updates = []
+        for pk, name, count in chunk:
+            actual = counts.get(pk, 0)
+            if count == actual:
+                continue
+            updates.append(tag_model(pk=pk, count=actual))
+            if report and dry_run:
+                report.write("  %s: %d should be %d\n" % (name, count, actual))
+
+        changed += len(updates)
+        if updates and not dry_run:
+            tag_model._base_manager.using(using).bulk_update(updates, ["count"])
+
+    if report:
+        report.write(
+            "%s %d tag%s for %s.%s\n"
+            % (
+                "Found wrong counts on" if dry_run else "Recounted",
+                changed,
+                "" if changed == 1 else "s",
+                tag_model._meta.app_label,
+                tag_model.__name__,
+            )
+        )
+    return changed
+
+
+def gc_tag_model(tag_model, chunk_size=1000, report=None):
+    """
+    Delete tags in the tag model which are no longer in use
+
+    If the tag model has count shards, they will be folded into the tag counts
+    first.
+
+    You will not normally need to call this directly - instead use the
+    management command ``tagulous_gc``.
+
+    Arguments:
+        tag_model   Tag model to clean up
+        chunk_size  Number of tags to delete in each query
+        report      Optional: a file handle to write verbose reports to
+
+    Returns the number of tags deleted.
+    """
+    using = router.db_for_write(tag_model)
+    qs = tag_model.objects.using(using)
+    qs.fold_count_shards()
+    deleted = qs.delete_unused(chunk_size=chunk_size)
+    if report:
+        report.write(
+            "Deleted %d unused tag%s from %s.%s\n"
+            % (
+                deleted,
+                "" if deleted == 1 else "s",
+                tag_model._meta.app_label,
+                tag_model.__name__,
+            )
+        )
+    return deleted
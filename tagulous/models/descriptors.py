@@ -43,10 +43,9 @@ class BaseTagDescriptor(object):
         Load initial tags
         Be prepared to receive a DatabaseError if the model has not been synced
         """
-        for tag_name in self.tag_options.initial:
-            self.tag_model.objects.get_or_create(
-                name=tag_name, defaults={"protected": self.tag_options.protect_initial}
-            )
+        self.tag_model.objects.bulk_get_or_create(
+            self.tag_options.initial, protected=self.tag_options.protect_initial
+        )
 
     def formfield(self, *args, **kwargs):
         """
@@ -92,6 +91,19 @@ class SingleTagDescriptor(BaseTagDescriptor):
             setattr(instance, attname, manager)
         return manager
 
+    def is_cached(self, instance):
+        """
+        Support prefetch_related by passing through to the FK descriptor
+        """
+        return self.descriptor.is_cached(instance)
+
+    def get_prefetch_queryset(self, instances, queryset=None):
+        return self.descriptor.get_prefetch_queryset(instances, queryset)
+
+    def get_prefetch_querysets(self, instances, querysets=None):
+        # Django 5.0+
+        return self.descriptor.get_prefetch_querysets(instances, querysets)
+
     def __get__(self, instance, instance_type=None):
         # If no instance, return self
         if not instance:
@@ -134,6 +146,12 @@ class TagDescriptor(BaseTagDescriptor):
     This will intercept calls for the RelatedManager, and add the tag functions
     """
 
+    def __init__(self, descriptor):
+        super(TagDescriptor, self).__init__(descriptor)
+
+        # Cache of TagRelatedManager classes, keyed by RelatedManager class
+        self.manager_classes = {}
+
     def get_manager(self, instance, instance_type=None):
         """
         Get the Manager instance for this field on this model instance.
@@ -186,15 +204,29 @@ class TagDescriptor(BaseTagDescriptor):
         manager = self.descriptor.__get__(instance, instance_type)
 
         # Add in the mixin
-        manager.__class__ = type(
-            str("TagRelatedManager"), (TagRelatedManagerMixin, manager.__class__), {}
-        )
+        manager.__class__ = self.get_manager_class(manager.__class__)
 
         # Manager is already instantiated; initialise tagulous in it
         manager.init_tagulous(self)
 
         return manager
 
+    def get_manager_class(self, manager_cls):
+        """
+        Get the TagRelatedManager class which adds the mixin to the given
+        RelatedManager class
+
+        Classes are created the first time they are needed, then cached on the
+        descriptor so they are shared by all instances.
+        """
+        cls = self.manager_classes.get(manager_cls)
+        if cls is None:
+            cls = type(
+                str("TagRelatedManager"), (TagRelatedManagerMixin, manager_cls), {}
+            )
+            self.manager_classes[manager_cls] = cls
+        return cls
+
     def __get__(self, instance, instance_type=None):
         # If no instance, return self
         if not instance:
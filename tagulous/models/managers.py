@@ -7,6 +7,7 @@ the tags.
 For tag model manager, look in tagulous.models.models
 """
 from django.core import exceptions
+from django.db import router, transaction
 
 from ..utils import parse_tags, render_tags
 
@@ -43,6 +44,13 @@ class SingleTagManager(object):
         # If there is a problem with the actual value, get_actual will fall
         # back to our cache, so make sure it exists first
         self.tag_cache = None
+
+        # If the tag was loaded by select_related or prefetch_related, keep it
+        # before get_actual flushes the FK descriptor's cache, so get_actual
+        # can use it for as long as it is the actual tag
+        self.fk_cache = None
+        if self.field.is_cached(self.instance):
+            self.fk_cache = self.field.get_cached_value(self.instance)
         self.tag_cache = self.get_actual()
 
         # Start off the local tag name with the actual tag name
@@ -74,6 +82,15 @@ class SingleTagManager(object):
 
         # Check the value if we need to
         if check_value:
+            # If the tag loaded with the instance is still the actual tag,
+            # there's no need to look it up
+            if self.fk_cache is not None and (
+                getattr(self.fk_cache, self.field.target_field.attname)
+                == self.instance.__dict__[self.field.attname]
+            ):
+                self.flush_cache()
+                return self.fk_cache
+
             try:
                 value = self.descriptor.descriptor.__get__(self.instance)
             except (self.tag_model.DoesNotExist, self.instance.DoesNotExist):
@@ -102,11 +119,22 @@ class SingleTagManager(object):
         """
         Set the actual value of the instance for the FK descriptor
         """
+        self.fk_cache = None
         self.descriptor.descriptor.__set__(self.instance, value)
 
         # Django 1.8 cache check fix (see comment in get_actual)
         self.flush_cache()
 
+    def load_tag(self, tag):
+        """
+        Use a tag which has been loaded for the instance, eg by
+        ``TaggedQuerySet.prefetch_tags()``, as the actual tag
+        """
+        self.fk_cache = tag
+        if not self.changed:
+            self.tag_cache = tag
+            self.tag_name = tag.name if tag else None
+
     def get(self):
         """
         Get the current tag - either a Tag object or None
@@ -122,10 +150,9 @@ class SingleTagManager(object):
 
             # Try to look up the tag
             try:
-                if self.tag_options.case_sensitive:
-                    tag = self.tag_model.objects.get(name=self.tag_name)
-                else:
-                    tag = self.tag_model.objects.get(name__iexact=self.tag_name)
+                tag = self.tag_model.objects.get(
+                    **{self.tag_options.normaliser.lookup: self.tag_name}
+                )
             except self.tag_model.DoesNotExist:
                 # Does not exist yet, create a temporary one (but don't save)
                 if not self.tag_cache:
@@ -145,9 +172,7 @@ class SingleTagManager(object):
 
         elif isinstance(value, str):
             # Force tag to lowercase
-            if self.tag_options.force_lowercase:
-                value = value.lower()
-            tag_name = value
+            tag_name = self.tag_options.normaliser.normalise(value)
 
         # Look up the tag name
         else:
@@ -275,43 +300,30 @@ class BaseTagRelatedManager(object):
         return self.get_tag_string()
 
     def __contains__(self, item):
-        item_str = str(item)
-        if self.tag_options.force_lowercase:
-            item_str = item_str.lower()
-
-        if self.tag_options.case_sensitive:
-            return item_str in [tag.name for tag in self.tags]
-        return item_str in [tag.name.lower() for tag in self.tags]
+        key = self.tag_options.normaliser.key
+        item_key = key(str(item))
+        return any(key(tag.name) == item_key for tag in self.tags)
 
     def __eq__(self, other):
         """
         Compare a tag string or iterable of tags to the tags on this manager
         """
         # If not case sensitive, or lowercase forced, compare on lowercase
-        lower = False
-        if self.tag_options.force_lowercase or not self.tag_options.case_sensitive:
-            lower = True
+        key = self.tag_options.normaliser.key
 
         # Prep other argument we're comparing against
         if isinstance(other, BaseTagRelatedManager):
             other = other.tags
         if isinstance(other, str):
-            other_str = str(other)
-
-            # Enforce case non-sensitivity or lowercase
-            if lower:
-                other_str = other_str.lower()
-
-            # Parse other_str into list of tags
+            # Parse other into list of tags, enforcing case non-sensitivity or
+            # lowercase
             other_tags = parse_tags(
-                other_str, space_delimiter=self.tag_options.space_delimiter
+                key(other), space_delimiter=self.tag_options.space_delimiter
             )
 
         else:
             # Assume it's an iterable
-            other_tags = other
-            if lower:
-                other_tags = [str(tag).lower() for tag in other]
+            other_tags = [key(str(tag)) for tag in other]
 
         # Get list of set tags
         self_tags = self.get_tag_list()
@@ -321,13 +333,10 @@ class BaseTagRelatedManager(object):
             return False
 
         # Compare tags
+        other_tags = set(other_tags)
         for tag in self_tags:
-            # If lowercase or not case sensitive, lower for comparison
-            if lower:
-                tag = tag.lower()
-
             # Check tag in other tags
-            if tag not in other_tags:
+            if key(tag) not in other_tags:
                 return False
 
         # Same number of tags, and all self tags present in other tags
@@ -388,24 +397,18 @@ class BaseTagRelatedManager(object):
                 % self.tag_options.max_count
             )
 
-        # Force tag_names to strings, in case it's a list of tags or a queryset
-        tag_names = [str(tag_name) for tag_name in tag_names]
+        # Force tag_names to strings, in case it's a list of tags or a queryset,
+        # and apply force_lowercase
+        normaliser = self.tag_options.normaliser
+        normalise = normaliser.normalise
+        tag_names = [normalise(str(tag_name)) for tag_name in tag_names]
 
-        # Apply force_lowercase
-        if self.tag_options.force_lowercase:
-            # Will be lowercase for later comparison
-            tag_names = [name.lower() for name in tag_names]
-
-        # Prep tag lookup
+        # Prep tag lookup, comparing on lowercase if not case sensitive
         # old_tags      = { cmp_name: tag }
         # cmp_new_names = { cmp_name: cased_name }
-        if self.tag_options.case_sensitive:
-            old_tags = dict([(tag.name, tag) for tag in self.tags])
-            cmp_new_names = dict([(n, n) for n in tag_names])
-        else:
-            # Not case sensitive - need to compare on lowercase
-            old_tags = dict([(tag.name.lower(), tag) for tag in self.tags])
-            cmp_new_names = dict([(name.lower(), name) for name in tag_names])
+        key = normaliser.key
+        old_tags = {key(tag.name): tag for tag in self.tags}
+        cmp_new_names = {key(name): name for name in tag_names}
 
         # See which tags are staying
         new_tags = []
@@ -419,14 +422,17 @@ class BaseTagRelatedManager(object):
                 self.changed = True
 
         # Only left with tag names which aren't present
-        for tag_name in cmp_new_names.values():
-            # Find or create all new tags
-            try:
-                if self.tag_options.case_sensitive:
-                    tag = self.tag_model.objects.get(name=tag_name)
-                else:
-                    tag = self.tag_model.objects.get(name__iexact=tag_name)
-            except self.tag_model.DoesNotExist:
+        # Find all existing tags for them in one query
+        db_tags = {}
+        if cmp_new_names:
+            db_tags = {
+                key(tag.name): tag
+                for tag in self.tag_model.objects.filter_names(cmp_new_names.values())
+            }
+
+        for cmp_name, tag_name in cmp_new_names.items():
+            tag = db_tags.get(cmp_name)
+            if tag is None:
                 # Don't create it until it's saved
                 tag = self.tag_model(name=tag_name, protected=False)
 
@@ -536,17 +542,23 @@ class TagRelatedManagerMixin(BaseTagRelatedManager):
 
         # Add and remove tags as necessary
         new_tags = self._ensure_tags_in_db(self.tags)
-        self.reload()
 
-        # Add new tags
-        for new_tag in new_tags:
-            if new_tag not in self.tags:
-                self.add(new_tag, _enforce_max_count=False)
+        # Load the tags in the database once and compare
+        self.reload()
+        old_pks = set(tag.pk for tag in self.tags)
+        new_pks = set(tag.pk for tag in new_tags)
+        add_tags = [tag for tag in new_tags if tag.pk not in old_pks]
+        rm_tags = [tag for tag in self.tags if tag.pk not in new_pks]
+
+        # Write the differences in bulk and update all counts together
+        db = router.db_for_write(self.through, instance=self.instance)
+        with transaction.atomic(using=db, savepoint=False):
+            if add_tags:
+                super(TagRelatedManagerMixin, self).add(*add_tags)
+            if rm_tags:
+                super(TagRelatedManagerMixin, self).remove(*rm_tags)
+            self._change_counts(add_tags, rm_tags)
 
-        # Remove old tags
-        for old_tag in self.tags:
-            if old_tag not in new_tags:
-                self.remove(old_tag)
         self.tags = new_tags
         self.changed = False
 
@@ -556,22 +568,20 @@ class TagRelatedManagerMixin(BaseTagRelatedManager):
         """
         Ensure that self.tags all exist in the database
         """
-        db_tags = []
-        for tag in tags:
-            if tag.pk:
-                # Already in DB
-                db_tag = tag
-            else:
-                # Not in DB - get or create
-                field_lookup = "name"
-                if not self.tag_options.case_sensitive:
-                    field_lookup += "__iexact"
-                db_tag, __ = self.tag_model.objects.get_or_create(
-                    defaults={"name": tag.name, "protected": False},
-                    **{field_lookup: tag.name},
-                )
-            db_tags.append(db_tag)
-        return db_tags
+        # Get or create any tags not in the DB
+        created = self.tag_model.objects.bulk_get_or_create(
+            [tag.name for tag in tags if not tag.pk]
+        )
+        return [tag if tag.pk else created[tag.name] for tag in tags]
+
+    def _change_counts(self, add_tags=(), rm_tags=()):
+        """
+        Increment the counts of added tags and decrement the counts of removed
+        tags, in a single query
+        """
+        amounts = dict((tag, 1) for tag in add_tags)
+        amounts.update((tag, -1) for tag in rm_tags)
+        self.tag_model.objects.change_counts(amounts)
 
     #
     # New set, add, remove and clear, to update tag counts
@@ -618,9 +628,8 @@ class TagRelatedManagerMixin(BaseTagRelatedManager):
 
         # Add to db, add to cache, and increment
         super(TagRelatedManagerMixin, self).add(*new_tags)
-        for tag in new_tags:
-            self.tags.append(tag)
-            tag.increment()
+        self.tags.extend(new_tags)
+        self._change_counts(add_tags=new_tags)
 
     add.alters_data = True
 
@@ -647,8 +656,7 @@ class TagRelatedManagerMixin(BaseTagRelatedManager):
 
         # Remove from db and decrement
         super(TagRelatedManagerMixin, self).remove(*self._ensure_tags_in_db(rm_tags))
-        for tag in rm_tags:
-            tag.decrement()
+        self._change_counts(rm_tags=rm_tags)
 
     remove.alters_data = True
 
@@ -658,8 +666,7 @@ class TagRelatedManagerMixin(BaseTagRelatedManager):
 
         # Clear db, then decrement and empty cache
         super(TagRelatedManagerMixin, self).clear()
-        for tag in self.tags:
-            tag.decrement()
+        self._change_counts(rm_tags=self.tags)
         self.tags = []
 
     clear.alters_data = True
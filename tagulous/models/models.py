@@ -1,12 +1,16 @@
 """
 Tagulous tag models
 """
-from django.db import IntegrityError, models, router, transaction
-from django.db.models import F, Max
-from django.db.models.functions import Floor
+import random
+
+from django.apps import apps
+from django.db import IntegrityError, connections, models, router, transaction
+from django.db.models import Case, F, Max, OuterRef, Subquery, Sum, When, sql
+from django.db.models.functions import Cast, Coalesce, Floor, Lower, Substr
 from django.utils.text import slugify
 
 from .. import constants, settings, utils
+from . import counts
 from .options import TagOptions
 
 
@@ -35,6 +39,483 @@ class TagModelQuerySet(models.query.QuerySet):
             | models.Q(name__in=self.model.tag_options.initial)
         )
 
+    def filter_names(self, names):
+        """
+        Reduce the queryset to tags matching any of the specified names, in a
+        single query.
+
+        Names are matched according to the tag model's case_sensitive option.
+        To map the results back to the names, compare them using
+        ``tag_options.normaliser.key``.
+        """
+        names = set(names)
+        normaliser = self.model.tag_options.normaliser
+        if normaliser.case_sensitive:
+            return self.filter(name__in=names)
+
+        # Compare on lowercase. Some databases (eg SQLite) only lowercase ASCII
+        # characters, so also match the exact names.
+        return self.annotate(_tagulous_name_lower=Lower("name")).filter(
+            models.Q(name__in=names)
+            | models.Q(_tagulous_name_lower__in={name.lower() for name in names})
+        )
+
+    def change_counts(self, amounts):
+        """
+        Change the counts of several tags in a single query
+
+        ``amounts`` is a dict of ``{tag: amount}``. The counts on the tag
+        instances will be reloaded, and any tags which are no longer in use will
+        be deleted, as for ``tag.decrement()``.
+
+        If ``TAGULOUS_DEFER_COUNTS`` is enabled and this is called inside a
+        transaction, the changes will be applied when the transaction commits.
+        """
+        tags = [tag for tag, amount in amounts.items() if amount]
+        if not tags:
+            return
+
+        pk_amounts = {}
+        for tag in tags:
+            pk_amounts[tag.pk] = pk_amounts.get(tag.pk, 0) + amounts[tag]
+
+        # Use DB for write for the update and the reload
+        using = self._db or router.db_for_write(self.model)
+        if settings.DEFER_COUNTS and counts.defer(self.model, using, pk_amounts):
+            # Changes will be applied on commit; update the instances to match
+            for tag in tags:
+                tag.count += amounts[tag]
+            return
+
+        qs = self.using(using)
+        if self.model.count_shard_model is None and counts.can_update_returning(
+            connections[using]
+        ):
+            # Get the new counts back from the update
+            db_counts = qs._update_counts_returning(pk_amounts)
+        else:
+            qs._update_counts(pk_amounts)
+            db_counts = qs.filter(pk__in=pk_amounts).get_counts()
+        for tag in tags:
+            tag.count = db_counts.get(tag.pk, tag.count)
+            tag.try_delete()
+
+    change_counts.alters_data = True
+
+    def _update_counts(self, amounts):
+        """
+        Internal method to change counts in a single query, where ``amounts``
+        is a dict of ``{pk: amount}``
+
+        If the tag model has count shards, the changes will be made to a
+        randomly chosen shard for each tag instead of to the tags.
+
+        Returns a list of the pks which were changed
+        """
+        if self.model.count_shard_model is not None:
+            return self._update_count_shards(amounts)
+
+        pks, count = self._get_count_update(amounts)
+        if pks:
+            self.filter(pk__in=pks).update(count=count)
+        return pks
+
+    _update_counts.alters_data = True
+
+    def _update_counts_returning(self, amounts):
+        """
+        Internal method to change counts in a single query, as for
+        ``_update_counts``, using ``UPDATE ... RETURNING`` to get the new counts
+        from the same query.
+
+        Only call this if ``counts.can_update_returning`` is True for the
+        database.
+
+        Returns a dict of the new counts, as ``{pk: count}``
+        """
+        pks, count = self._get_count_update(amounts)
+        if not pks:
+            return {}
+
+        # Django has no API for UPDATE ... RETURNING, so build the update query
+        # as QuerySet.update() would, then add the RETURNING clause
+        qs = self.filter(pk__in=pks)
+        query = qs.query.chain(sql.UpdateQuery)
+        query.add_update_values({"count": count})
+        query.annotations = {}
+        update_sql, params = query.get_compiler(qs.db).as_sql()
+
+        connection = connections[qs.db]
+        opts = self.model._meta
+        pk_field = opts.pk
+        returning_sql = "%s RETURNING %s, %s" % (
+            update_sql,
+            connection.ops.quote_name(pk_field.column),
+            connection.ops.quote_name(opts.get_field("count").column),
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(returning_sql, params)
+            rows = cursor.fetchall()
+        return {pk_field.to_python(pk): db_count for pk, db_count in rows}
+
+    _update_counts_returning.alters_data = True
+
+    def _update_count_shards(self, amounts):
+        """
+        Internal method to change counts on the count shards, where ``amounts``
+        is a dict of ``{pk: amount}``
+
+        The same randomly chosen shard is used for each tag, and any shard rows
+        which do not exist yet are created.
+
+        Returns a list of the pks which were changed
+        """
+        pks, count = self._get_count_update(amounts, field="tag_id")
+        if not pks:
+            return pks
+
+        shard_model = self.model.count_shard_model
+        db = self._db or router.db_for_write(self.model)
+        shard = random.randrange(self.model.tag_options.count_shards)
+        shards = shard_model._base_manager.using(db).filter(
+            tag_id__in=pks, shard=shard
+        )
+
+        # Shard rows are created on first use and not deleted until their tag is
+        # deleted, so missing rows can be created without conflicting changes
+        existing = set(shards.values_list("tag_id", flat=True))
+        missing = [pk for pk in pks if pk not in existing]
+        if missing:
+            shard_model._base_manager.using(db).bulk_create(
+                [shard_model(tag_id=pk, shard=shard) for pk in missing],
+                ignore_conflicts=True,
+            )
+        shards.update(count=count)
+        return pks
+
+    _update_count_shards.alters_data = True
+
+    def _get_count_update(self, amounts, field="pk"):
+        """
+        Internal method to build the expression to change counts, where
+        ``amounts`` is a dict of ``{pk: amount}``, and ``field`` is the name of
+        the field which holds the tag pk
+
+        Returns a tuple of ``(pks, expression)``
+        """
+        # Group by amount so there is one WHEN clause per amount
+        pks_by_amount = {}
+        for pk, amount in amounts.items():
+            if amount:
+                pks_by_amount.setdefault(amount, []).append(pk)
+
+        pks = [pk for pks in pks_by_amount.values() for pk in pks]
+        count = Case(
+            *[
+                When(**{"%s__in" % field: amount_pks, "then": F("count") + amount})
+                for amount, amount_pks in pks_by_amount.items()
+            ],
+            default=F("count"),
+        )
+        return pks, count
+
+    def get_counts(self):
+        """
+        Return a dict of the counts of the tags in the queryset, as
+        ``{pk: count}``
+
+        If the tag model has count shards, the counts will include any changes
+        held in the shards which have not been folded into the tags yet.
+        """
+        db_counts = dict(self.order_by().values_list("pk", "count"))
+        shard_model = self.model.count_shard_model
+        if shard_model is not None and db_counts:
+            shard_counts = (
+                shard_model._base_manager.using(self.db)
+                .filter(tag_id__in=list(db_counts))
+                .order_by()
+                .values("tag_id")
+                .annotate(total=Sum("count"))
+                .values_list("tag_id", "total")
+            )
+            for pk, total in shard_counts:
+                db_counts[pk] += total
+        return db_counts
+
+    def fold_count_shards(self):
+        """
+        Add the changes held in count shards to the counts on the tags in the
+        queryset, and reset the shards
+
+        Does nothing if the tag model does not have count shards.
+
+        Returns the number of tags which were changed.
+        """
+        shard_model = self.model.count_shard_model
+        if shard_model is None:
+            return 0
+
+        db = self._db or router.db_for_write(self.model)
+        with transaction.atomic(using=db):
+            # Lock the shards so changes are not lost between reading and
+            # resetting them
+            shards = list(
+                shard_model._base_manager.using(db)
+                .select_for_update()
+                .filter(tag_id__in=self.values("pk"))
+                .exclude(count=0)
+                .order_by("pk")
+                .values_list("pk", "tag_id", "count")
+            )
+            if not shards:
+                return 0
+
+            amounts = {}
+            for shard_pk, tag_pk, count in shards:
+                amounts[tag_pk] = amounts.get(tag_pk, 0) + count
+            pks, count = self._get_count_update(amounts)
+            if pks:
+                self.model._base_manager.using(db).filter(pk__in=pks).update(
+                    count=count
+                )
+            shard_model._base_manager.using(db).filter(
+                pk__in=[shard[0] for shard in shards]
+            ).update(count=0)
+        return len(pks)
+
+    fold_count_shards.alters_data = True
+
+    def delete_unused(self, chunk_size=None):
+        """
+        Delete tags in the queryset which are not in use, in bulk
+
+        Tags are not in use if they have a count of 0 and are not protected,
+        and there are no ForeignKeys or ManyToManyFields referring to them. For
+        tag trees, any parents which are no longer in use will also be deleted,
+        one level at a time.
+
+        If ``chunk_size`` is set, tags will be deleted in chunks of that size.
+
+        Returns the number of tags deleted.
+        """
+        if self.model.tag_options.protect_all:
+            return 0
+
+        # Exclude tags which are referred to, using anti-joins
+        qs = self.using(self._db or router.db_for_write(self.model))
+        shard_model = self.model.count_shard_model
+        if shard_model is None:
+            unused = qs.filter(count=0, protected=False)
+        else:
+            # Include changes held in count shards
+            shard_total = (
+                shard_model._base_manager.filter(tag_id=OuterRef("pk"))
+                .order_by()
+                .values("tag_id")
+                .annotate(total=Sum("count"))
+                .values("total")
+            )
+            unused = qs.annotate(
+                _tagulous_count=F("count") + Coalesce(Subquery(shard_total), 0)
+            ).filter(_tagulous_count=0, protected=False)
+        for related in self.model.get_related_fields(include_standard=True):
+            unused = unused.exclude(
+                **{"%s__isnull" % related.field.related_query_name(): False}
+            )
+
+        deleted = 0
+        parent_pks = set()
+        while True:
+            pks = unused.order_by("pk").values_list("pk", flat=True)
+            pks = list(pks[:chunk_size] if chunk_size else pks)
+            if not pks:
+                break
+
+            if self.model.tag_options.tree:
+                parent_pks.update(
+                    qs.filter(pk__in=pks, parent__isnull=False)
+                    .order_by()
+                    .values_list("parent_id", flat=True)
+                )
+
+            # Check they are still unused as we delete them
+            __, deleted_by_model = unused.filter(pk__in=pks).delete()
+            deleted += deleted_by_model.get(self.model._meta.label, 0)
+            if not chunk_size:
+                break
+
+        # Parent nodes may now be empty
+        if parent_pks:
+            deleted += (
+                self.model.objects.using(qs.db)
+                .filter(pk__in=parent_pks)
+                .delete_unused(chunk_size=chunk_size)
+            )
+        return deleted
+
+    delete_unused.alters_data = True
+
+    def bulk_get_or_create(self, names, protected=False):
+        """
+        Get or create tags for a list of tag names in bulk
+
+        Returns a dict of ``{name: tag}``. Names are matched according to the
+        tag model's case_sensitive option, and any new tags are created with
+        the specified ``protected`` value.
+        """
+        return self._bulk_get_or_create(
+            names, lambda name: self.model(name=name, protected=protected)
+        )
+
+    bulk_get_or_create.alters_data = True
+
+    def _bulk_get_or_create(self, names, build):
+        """
+        Internal method to get or create tags for a list of tag names, calling
+        ``build(name)`` to create an unsaved instance for each missing tag
+        """
+        names = list(names)
+        if not names:
+            return {}
+
+        # Use DB for write so we see what we've just created
+        qs = self.using(self._db or router.db_for_write(self.model))
+        normaliser = self.model.tag_options.normaliser
+        key = normaliser.key
+
+        # Find existing tags
+        tags = qs._get_tags_by_key(names)
+        missing = {}
+        for name in names:
+            if key(name) not in tags:
+                missing.setdefault(key(name), name)
+
+        if missing:
+            # Create missing tags, ignoring any which have been created since
+            new_tags = [build(name) for name in missing.values()]
+            qs._set_slugs(new_tags)
+            qs.bulk_create(new_tags, ignore_conflicts=True)
+
+            # Bulk create won't have set pks, so load them
+            tags.update(qs._get_tags_by_key(missing.values()))
+
+            # If any still failed, a slug may have clashed with a tag created
+            # since - fall back to creating them one at a time
+            for cmp_name, name in missing.items():
+                if cmp_name not in tags:
+                    tag = build(name)
+                    tags[cmp_name], __ = qs.get_or_create(
+                        defaults={"name": tag.name, "protected": tag.protected},
+                        **{normaliser.lookup: name},
+                    )
+
+        return {name: tags[key(name)] for name in names}
+
+    def _get_tags_by_key(self, names):
+        """
+        Return a dict of ``{key: tag}`` for tags matching the names, where the
+        key is the normalised name used for comparison
+        """
+        key = self.model.tag_options.normaliser.key
+        return {key(tag.name): tag for tag in self.filter_names(names)}
+
+    def _set_slugs(self, tags):
+        """
+        Set unique slugs on a list of unsaved tags
+
+        Existing slugs are found in a single query, and the numbers for slugs
+        which clash are found in a second query. Used by ``tag.save()``, and to
+        reserve slugs for many tags at once when creating tags in bulk.
+        """
+        slug_max_length = self.model._meta.get_field("slug").max_length
+        numbered_length = slug_max_length - settings.SLUG_TRUNCATE_UNIQUE
+
+        # Slugs must be unique for a tree level, so include the parent
+        if self.model.tag_options.tree:
+            unique_fields = ["parent_id", "slug"]
+        else:
+            unique_fields = ["slug"]
+
+        def get_unique_key(tag, slug):
+            return tuple(getattr(tag, field) for field in unique_fields[:-1]) + (slug,)
+
+        slug_bases = [tag._get_slug_base() for tag in tags]
+        used = set(
+            self.filter(
+                slug__in=set(slug_base[:slug_max_length] for slug_base in slug_bases)
+            )
+            # Tags which are already saved may be rebuilding their slugs
+            .exclude(pk__in=[tag.pk for tag in tags if tag.pk is not None])
+            .order_by()
+            .values_list(*unique_fields)
+        )
+
+        clashes = []
+        for tag, slug_base in zip(tags, slug_bases):
+            slug = slug_base[:slug_max_length]
+            unique_key = get_unique_key(tag, slug)
+            if unique_key in used:
+                clashes.append((tag, slug_base[:numbered_length]))
+                continue
+            tag.slug = slug
+            used.add(unique_key)
+
+        if clashes:
+            # See which numbers have been used, including by the new tags
+            numbers = self._get_slug_numbers(slug_base for tag, slug_base in clashes)
+            for tag in tags:
+                if tag.slug and "_" in tag.slug:
+                    slug_base, number = tag.slug.rsplit("_", 1)
+                    if slug_base in numbers and number.isdigit():
+                        numbers[slug_base] = max(numbers[slug_base], int(number))
+
+            for tag, slug_base in clashes:
+                numbers[slug_base] += 1
+                tag.slug = "%s_%d" % (slug_base, numbers[slug_base])
+
+        for tag in tags:
+            tag._update_extra()
+
+    def _get_slug_numbers(self, slug_bases):
+        """
+        Find the highest number used by numbered slugs in the form
+        ``<slug_base>_<number>`` for each slug base, in a single query
+
+        Each slug base is found with an indexed ``startswith`` range lookup,
+        and the numbers are compared in the database.
+
+        Returns a dict of ``{slug_base: number}``, where number is ``0`` if
+        there are no numbered slugs for the slug base
+        """
+        slug_bases = list(dict.fromkeys(slug_bases))
+        query = models.Q()
+        aggregates = {}
+        for index, slug_base in enumerate(slug_bases):
+            prefix = "%s_" % slug_base
+            query |= models.Q(slug__startswith=prefix)
+
+            # Only convert numbers for slugs which match the pattern
+            aggregates["number_%d" % index] = Max(
+                Case(
+                    When(
+                        models.Q(
+                            slug__startswith=prefix,
+                            # Limit the digits so the number fits a bigint
+                            slug__regex="^%s[0-9]{1,18}$" % prefix,
+                        ),
+                        then=Cast(
+                            Substr("slug", len(prefix) + 1), models.BigIntegerField()
+                        ),
+                    )
+                )
+            )
+
+        numbers = self.filter(query).order_by().aggregate(**aggregates)
+        return {
+            slug_base: numbers["number_%d" % index] or 0
+            for index, slug_base in enumerate(slug_bases)
+        }
+
     def weight(self, min=settings.WEIGHT_MIN, max=settings.WEIGHT_MAX):
         """
         Add a ``weight`` integer field to objects, weighting the ``count``
@@ -121,6 +602,17 @@ class TagModelBase(models.base.ModelBase):
                 # Change it to use this one
                 field.tag_options = new_tag_options
 
+        # Create a model to hold count shards, if needed. Proxy models will use
+        # the shard model of the model they proxy.
+        #
+        # Historical models built for migrations don't get one - the shard
+        # model has its own migration state, and registering another would
+        # conflict with it. Their count changes go straight to the tags.
+        if not new_cls._meta.abstract and not new_cls._meta.proxy:
+            new_cls.count_shard_model = None
+            if new_tag_options.count_shards and new_cls._meta.apps is apps:
+                new_cls.count_shard_model = create_count_shard_model(new_cls)
+
         return new_cls
 
 
@@ -138,6 +630,9 @@ class BaseTagModel(models.Model, metaclass=TagModelBase):
 
     objects = TagModelManager()
 
+    # Model holding count shards, if the count_shards option is set
+    count_shard_model = None
+
     class Meta:
         abstract = True
 
@@ -243,13 +738,57 @@ class BaseTagModel(models.Model, metaclass=TagModelBase):
             data = list(set(data))
         return data
 
+    def _get_related_querysets(self, include_standard=False):
+        """
+        Generator to yield a queryset for each related field, of the rows
+        which refer to this tag instance
+
+        For M2M fields this will be a queryset of the through model, so rows can
+        be counted without joining the related model.
+        """
+        using = router.db_for_write(self.tag_model)
+        for related in self.get_related_fields(include_standard=include_standard):
+            field = related.field
+            if field.many_to_many:
+                yield field.remote_field.through._base_manager.using(using).filter(
+                    **{field.m2m_reverse_field_name(): self.pk}
+                )
+            else:
+                yield related.related_model._base_manager.using(using).filter(
+                    **{field.name: self}
+                )
+
+    def get_related_count(self, include_standard=False):
+        """
+        Count how many times other models refer to this tag instance, using one
+        count query for each related field
+
+        If include_standard=False (default), only SingleTagFields and
+        TagFields will be counted. If True, it will also count ForeignKeys
+        and ManyToManyFields.
+        """
+        return sum(qs.count() for qs in self._get_related_querysets(include_standard))
+
+    def has_related(self, include_standard=False):
+        """
+        Check if any other models refer to this tag instance, using an exists
+        query for each related field until one is found
+
+        If include_standard=False (default), only SingleTagFields and
+        TagFields will be checked. If True, it will also check ForeignKeys
+        and ManyToManyFields.
+        """
+        return any(qs.exists() for qs in self._get_related_querysets(include_standard))
+
     def update_count(self):
         """
         Count how many SingleTagFields and TagFields refer to this tag, save,
         and try to delete.
         """
-        self.count = len(self.get_related_objects(flat=True))
+        self.count = self.get_related_count()
         self.save()
+        if self.count_shard_model is not None:
+            self.count_shard_model._base_manager.filter(tag=self).update(count=0)
         self.try_delete()
 
     update_count.alters_data = True
@@ -274,22 +813,24 @@ class BaseTagModel(models.Model, metaclass=TagModelBase):
         """
         Change count by amount
         """
-        self.__class__.objects.filter(pk=self.pk).update(
-            count=models.F("count") + amount
-        )
+        # Tag has been deleted
+        if self.pk is None:
+            raise self.DoesNotExist(
+                "%s matching query does not exist." % self._meta.object_name
+            )
 
-        # Reload count
-        # Use DB for write because we just updated the value
+        # Use DB for write because we will reload the value
         using = router.db_for_write(self.tag_model, instance=self)
-        self.refresh_from_db(using=using)
-
-        self.try_delete()
+        self.__class__.objects.using(using).change_counts({self: amount})
 
     def try_delete(self):
         """
         If count is 0, try to delete this tag
+
+        Does nothing if ``TAGULOUS_DELETE_INLINE`` is ``False``; unused tags
+        will instead be deleted by ``tagulous_gc``.
         """
-        if self.count != 0:
+        if self.count != 0 or not settings.DELETE_INLINE:
             return
 
         # See if it's protected
@@ -297,8 +838,7 @@ class BaseTagModel(models.Model, metaclass=TagModelBase):
         if not is_protected:
             # Before we delete, check for any standard relationships
             # This will catch if the tag is in a tree with children
-            true_count = len(self.get_related_objects(flat=True, include_standard=True))
-            if true_count > 0:
+            if self.has_related(include_standard=True):
                 # ForeignKeys or ManyToManyFields refer to it
                 # We can't delete (we'll break things)
                 # Tag is protected, for now
@@ -371,6 +911,24 @@ class BaseTagModel(models.Model, metaclass=TagModelBase):
         """
         pass
 
+    def _get_slug_base(self):
+        """
+        Return the slug to use for this tag before it is truncated or made
+        unique, using the label if possible (for TagTreeModel), else the tag name.
+        """
+        label = getattr(self, "label", self.name)
+        if settings.SLUG_ALLOW_UNICODE:
+            return slugify(label, allow_unicode=True)
+
+        slug_base = slugify(label, allow_unicode=False)
+
+        # Django 3.2 strips trailing and leading underscores; this risks creating an
+        # empty slug for unconvertable characters, eg logographic characters. Ensure
+        # they are not empty.
+        if slug_base == "":
+            slug_base = "_"
+        return slug_base
+
     def _save_direct(self, *args, **kwargs):
         """
         Save without modifying data
@@ -386,9 +944,8 @@ class BaseTagModel(models.Model, metaclass=TagModelBase):
         """
         # Based on django-taggit: don't worry about race conditions when
         # setting names and slugs, just avoid potential slugify clashes.
-        # We could improve this if race conditions are ever a problem in the
-        # real world, but until Django provides a reliable way to determine
-        # the cause of an IntegrityError, we can never make this perfect.
+        # If another process saves the same slug at the same time, try once
+        # more with a new slug.
 
         # If already in the database and has a slug set, just save as normal
         # Set slug to None to rebuild it
@@ -396,54 +953,27 @@ class BaseTagModel(models.Model, metaclass=TagModelBase):
             self._update_extra()
             return super(BaseTagModel, self).save(*args, **kwargs)
 
-        # Set the slug using the label if possible (for TagTreeModel), else
-        # the tag name.
-        label = getattr(self, "label", self.name)
-        slug_max_length = self.__class__._meta.get_field("slug").max_length
-        if settings.SLUG_ALLOW_UNICODE:
-            slug_base = slugify(label, allow_unicode=True)
-        else:
-            slug_base = slugify(label, allow_unicode=False)
-
-            # Django 3.2 strips trailing and leading underscores; this risks creating an
-            # empty slug for unconvertable characters, eg logographic characters. Ensure
-            # they are not empty.
-            if slug_base == "":
-                slug_base = "_"
-
-        # ASCII-ification can make a longer string
-        self.slug = slug_base[:slug_max_length]
-        self._update_extra()
-
         # Make sure we're using the same db at all times
         cls = self.__class__
         kwargs["using"] = kwargs.get("using") or router.db_for_write(cls, instance=self)
 
+        # Find a unique slug, appending a number if it clashes
+        qs = cls.objects.using(kwargs["using"])
+        qs._set_slugs([self])
+
         # Try saving the slug - it'll probably be fine
         try:
             # If transaction supports atomic, we need to wrap the save call -
             # otherwise if save throws an exception it'll cause any current
             # queries to roll back
-            with transaction.atomic():
+            with transaction.atomic(using=kwargs["using"]):
                 return super(BaseTagModel, self).save(*args, **kwargs)
         except IntegrityError:
             pass
 
         # Integrity error - something is probably not unique.
-        # Assume it was the slug - make it unique by appending a number.
-        # See which numbers have been used
-        slug_base = slug_base[: slug_max_length - settings.SLUG_TRUNCATE_UNIQUE]
-        based_objects = cls.objects.filter(slug__regex="^%s_[0-9]+$" % slug_base)
-        based_slugs = list(based_objects.values_list("slug", flat=True))
-        if len(based_slugs) == 0:
-            # No numbered version of the slug exists
-            number = 1
-        else:
-            numbers = [int(slug.rsplit("_", 1)[1]) for slug in based_slugs]
-            number = sorted(numbers)[-1] + 1
-
-        self.slug = "%s_%d" % (slug_base, number)
-        self._update_extra()
+        # Assume another process took the slug, and find a new one.
+        qs._set_slugs([self])
         return super(BaseTagModel, self).save(*args, **kwargs)
 
     save.alters_data = True
@@ -479,6 +1009,58 @@ class TagModel(BaseTagModel):
         unique_together = (("slug",),)
 
 
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+#       Count shards
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+
+class BaseTagCountShard(models.Model):
+    """
+    Abstract base class for count shard models
+
+    If the ``count_shards`` option is set, changes to tag counts are spread
+    across that number of shard rows for each tag, to avoid contention on the
+    tag rows. The ``count`` on the tag holds the count when the shards were last
+    folded into it.
+    """
+
+    shard = models.PositiveSmallIntegerField()
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        abstract = True
+
+
+def create_count_shard_model(tag_model):
+    """
+    Create a count shard model for the given tag model
+    """
+    # Name is Tagulous_TAGMODEL_count_shards
+    name = tag_model._meta.object_name
+    if not name.startswith(constants.MODEL_PREFIX + "_"):
+        name = "%s_%s" % (constants.MODEL_PREFIX, name)
+
+    meta = type(
+        "Meta",
+        (),
+        {
+            "app_label": tag_model._meta.app_label,
+            "unique_together": (("tag", "shard"),),
+        },
+    )
+    return type(
+        "%s_count_shards" % name,
+        (BaseTagCountShard,),
+        {
+            "__module__": tag_model.__module__,
+            "Meta": meta,
+            "tag": models.ForeignKey(
+                tag_model, on_delete=models.CASCADE, related_name="+"
+            ),
+        },
+    )
+
+
 # ##############################################################################
 # ###### TagTreeModel manager and queryset
 # ##############################################################################
@@ -537,6 +1119,52 @@ class TagTreeModelQuerySet(TagModelQuerySet):
 
         return self._clean().filter(query)
 
+    def bulk_get_or_create(self, names, protected=False):
+        """
+        Get or create tags for a list of tag names in bulk, creating any
+        missing ancestors one level at a time
+
+        Returns a dict of ``{name: tag}``. Ancestors are created unprotected.
+        """
+        names = list(names)
+        key = self.model.tag_options.normaliser.key
+
+        # Find all names and their ancestors, grouped by level
+        clean_names = {}
+        levels = {}
+        for name in names:
+            clean_names[name] = utils.clean_tree_name(name)
+            parts = utils.split_tree_name(clean_names[name])
+            for level in range(1, len(parts) + 1):
+                levels.setdefault(level, []).append(utils.join_tree_name(parts[:level]))
+        requested = set(key(clean_name) for clean_name in clean_names.values())
+
+        tags = {}
+
+        def build(name):
+            parts = utils.split_tree_name(name)
+            tag = self.model(
+                name=name,
+                protected=protected and key(name) in requested,
+                label=parts[-1],
+                level=len(parts),
+            )
+            if len(parts) > 1:
+                # Match the name to the parent in case it differs by case
+                tag.parent = tags[key(utils.join_tree_name(parts[:-1]))]
+                tag.name = utils.join_tree_name(
+                    utils.split_tree_name(tag.parent.name) + parts[-1:]
+                )
+            return tag
+
+        for level in sorted(levels):
+            for name, tag in self._bulk_get_or_create(levels[level], build).items():
+                tags[key(name)] = tag
+
+        return {name: tags[key(clean_names[name])] for name in names}
+
+    bulk_get_or_create.alters_data = True
+
 
 class TagTreeModelManager(TagModelManager):
     def get_queryset(self):
@@ -695,9 +1323,10 @@ class BaseTagTreeModel(BaseTagModel, metaclass=TagTreeModelBase):
         parts = utils.split_tree_name(self.name)
         old_parent = self.parent
         if len(parts) > 1:
-            self.parent, created = self.__class__.objects.get_or_create(
-                name=utils.join_tree_name(parts[:-1])
-            )
+            parent_name = utils.join_tree_name(parts[:-1])
+            self.parent = self.__class__.objects.bulk_get_or_create([parent_name])[
+                parent_name
+            ]
         else:
             self.parent = None
 
@@ -5,6 +5,49 @@ from .. import constants
 from ..utils import parse_tags, render_tags
 
 
+def _unchanged(name):
+    return name
+
+
+class TagNormaliser(object):
+    """
+    Apply the force_lowercase and case_sensitive tag options to tag names
+
+    Built once per TagOptions (see ``TagOptions.normaliser``) so that code which
+    handles many tag names does not need to check the options for each name.
+
+    Attributes:
+        normalise   Function to convert a new tag name to the form it will be
+                    stored in; lowercase if force_lowercase is set
+        key         Function to convert a tag name to a key for comparing it
+                    with other tag names; lowercase unless case_sensitive is set
+                    without force_lowercase
+        lookup      The ORM lookup to find a tag by name on the tag model
+    """
+
+    def __init__(self, force_lowercase=False, case_sensitive=False):
+        self.force_lowercase = force_lowercase
+        self.case_sensitive = case_sensitive
+
+        self.normalise = str.lower if force_lowercase else _unchanged
+        if force_lowercase or not case_sensitive:
+            self.key = str.lower
+        else:
+            self.key = _unchanged
+        self.lookup = self.name_lookup("exact")
+
+    def name_lookup(self, lookup):
+        """
+        Return the ORM lookup on the name field for the given lookup type, eg
+        ``startswith`` will become ``name__istartswith`` unless case sensitive
+        """
+        if self.case_sensitive:
+            if lookup == "exact":
+                return "name"
+            return "name__%s" % lookup
+        return "name__i%s" % lookup
+
+
 class TagOptions(object):
     """
     Simple class container for tag options
@@ -73,6 +116,10 @@ class TagOptions(object):
 
         elif name in constants.OPTION_DEFAULTS:
             self.__dict__[name] = value
+
+            # Normaliser will need to be rebuilt
+            if name in ("force_lowercase", "case_sensitive"):
+                self.__dict__.pop("normaliser", None)
         else:
             raise AttributeError(name)
 
@@ -87,6 +134,15 @@ class TagOptions(object):
             # If here, there is no initial set in the __dict__
             # There is nothing in defaults to fall back to either
             return ""
+        if name == "normaliser":
+            # Build the normaliser and store it in __dict__, so future lookups
+            # will not come through here until an option it uses is changed
+            normaliser = TagNormaliser(
+                force_lowercase=self.force_lowercase,
+                case_sensitive=self.case_sensitive,
+            )
+            self.__dict__["normaliser"] = normaliser
+            return normaliser
         if name not in constants.OPTION_DEFAULTS:
             raise AttributeError(name)
         return self.__dict__.get(name, constants.OPTION_DEFAULTS[name])
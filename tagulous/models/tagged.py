@@ -7,11 +7,13 @@ is enabled.
 import copy
 
 import django
-from django.core.exceptions import FieldDoesNotExist
-from django.db import models, transaction
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db import connections, models, router, transaction
+from django.db.models.deletion import Collector
 
 from .. import utils
-from ..constants import TAGGED_ATTR_MANAGER
+from ..constants import TAGGED_ATTR_DELETED, TAGGED_ATTR_FIELDS, TAGGED_ATTR_MANAGER
+from . import counts
 from .cast import cast_instance
 from .fields import (
     BaseTagField,
@@ -111,6 +113,23 @@ class TaggedQuerySet(models.query.QuerySet):
     A QuerySet with support for Tagulous tag fields
     """
 
+    # Tag fields to load with the results, set by prefetch_tags(). These are
+    # class attributes because cast querysets are not initialised by this class
+    _tagulous_prefetch = ()
+    _tagulous_prefetch_done = False
+
+    def _clone(self):
+        qs = super(TaggedQuerySet, self)._clone()
+        qs._tagulous_prefetch = self._tagulous_prefetch
+        return qs
+
+    def _fetch_all(self):
+        super(TaggedQuerySet, self)._fetch_all()
+        if self._tagulous_prefetch and not self._tagulous_prefetch_done:
+            if issubclass(self._iterable_class, models.query.ModelIterable):
+                self._prefetch_tags_objects()
+            self._tagulous_prefetch_done = True
+
     def _filter_or_exclude(self, negate, *args, **kwargs):
         """
         Custom lookups for tag fields
@@ -131,9 +150,8 @@ class TaggedQuerySet(models.query.QuerySet):
         for field_name, val in singletag_fields.items():
             query_field_name = field_name
             if isinstance(val, str):
-                query_field_name += "__name"
-                if not field_lookup[field_name].tag_options.case_sensitive:
-                    query_field_name += "__iexact"
+                normaliser = field_lookup[field_name].tag_options.normaliser
+                query_field_name += "__" + normaliser.lookup
             safe_fields[query_field_name] = val
 
         # Query as normal
@@ -186,9 +204,7 @@ class TaggedQuerySet(models.query.QuerySet):
                 subqs = subqs.order_by("name")
 
             # Prep the field name
-            query_field_name = field_name + "__name"
-            if not tag_options.case_sensitive:
-                query_field_name += "__iexact"
+            query_field_name = field_name + "__" + tag_options.normaliser.lookup
 
             # Now chain the filters for each tag
             #
@@ -229,6 +245,144 @@ class TaggedQuerySet(models.query.QuerySet):
 
             return obj
 
+    def bulk_create(self, objs, *args, **kwargs):
+        """
+        Create objects in bulk, as for a normal ``bulk_create``, but also save
+        the values of their tag fields
+
+        All new tags for each tag field are created together, the TagField
+        relationships are inserted together, and the tag counts are updated
+        with one query for each tag model.
+
+        The database must set the primary keys of the new objects, otherwise
+        TagField values cannot be saved.
+
+        Tag field values cannot be saved with ``ignore_conflicts`` or
+        ``update_conflicts``, because the objects which were not inserted
+        cannot be told apart.
+        """
+        objs = list(objs)
+        conflicts = (
+            kwargs.get("ignore_conflicts")
+            or kwargs.get("update_conflicts")
+            or any(args[1:3])
+        )
+        if conflicts and self._has_tag_values(objs):
+            raise ValueError(
+                "Cannot save tag fields with bulk_create when ignore_conflicts or "
+                "update_conflicts is set"
+            )
+
+        using = self._db or router.db_for_write(self.model)
+        with transaction.atomic(using=using, savepoint=False):
+            # Count changes as ``{tag_model: {tag: amount}}``
+            amounts = {}
+            for field in singletagfields_from_model(self.model):
+                self._bulk_set_singletags(objs, field, using, amounts)
+
+            objs = super(TaggedQuerySet, self).bulk_create(objs, *args, **kwargs)
+
+            for field in tagfields_from_model(self.model):
+                self._bulk_add_tagfield(objs, field, using, amounts)
+
+            for tag_model, tag_amounts in amounts.items():
+                tag_model.objects.using(using).change_counts(tag_amounts)
+        return objs
+
+    def _has_tag_values(self, objs):
+        """
+        Return True if any of the unsaved objects have values set on their tag
+        fields
+        """
+        for field in singletagfields_from_model(self.model):
+            attname = field.get_manager_name()
+            for obj in objs:
+                manager = obj.__dict__.get(attname)
+                if manager is not None and manager.changed and manager.tag_name:
+                    return True
+
+        for field in tagfields_from_model(self.model):
+            attname = field.get_manager_name()
+            for obj in objs:
+                manager = obj.__dict__.get(attname)
+                if manager is not None and manager.tags:
+                    return True
+        return False
+
+    def _bulk_set_singletags(self, objs, field, using, amounts):
+        """
+        Set the tags of a SingleTagField on unsaved objects, getting or
+        creating them together, and add them to the count changes
+        """
+        attname = field.get_manager_name()
+        managers = []
+        for obj in objs:
+            manager = obj.__dict__.get(attname)
+            if manager is not None and manager.changed:
+                managers.append(manager)
+            elif field.required and obj.__dict__.get(field.attname) is None:
+                raise ValidationError(field.error_messages["null"])
+
+        names = set(manager.tag_name for manager in managers if manager.tag_name)
+        tags = field.tag_model.objects.using(using).bulk_get_or_create(names)
+
+        model_amounts = amounts.setdefault(field.tag_model, {})
+        for manager in managers:
+            tag = tags[manager.tag_name] if manager.tag_name else None
+            if not tag and field.required:
+                raise ValidationError(field.error_messages["null"])
+            manager.set_actual(tag)
+            manager.changed = False
+            manager.load_tag(tag)
+            if tag:
+                model_amounts[tag] = model_amounts.get(tag, 0) + 1
+
+    def _bulk_add_tagfield(self, objs, field, using, amounts):
+        """
+        Save the tags of a TagField on newly created objects, getting or
+        creating them together and inserting all the relationships together,
+        and add them to the count changes
+        """
+        attname = field.get_manager_name()
+        managers = [
+            (obj, obj.__dict__[attname])
+            for obj in objs
+            if attname in obj.__dict__ and obj.__dict__[attname].tags
+        ]
+        if not managers:
+            return
+        if any(obj.pk is None for obj, manager in managers):
+            raise ValueError(
+                "Cannot save %s with bulk_create: the database did not return "
+                "the primary keys of the new objects" % field.name
+            )
+
+        # Create any missing tags
+        names = set(
+            tag.name for obj, manager in managers for tag in manager.tags if not tag.pk
+        )
+        created = field.tag_model.objects.using(using).bulk_get_or_create(names)
+
+        # Add the relationships
+        through = field.remote_field.through
+        source_attname = through._meta.get_field(field.m2m_field_name()).attname
+        target_attname = through._meta.get_field(field.m2m_reverse_field_name()).attname
+        links = []
+        model_amounts = amounts.setdefault(field.tag_model, {})
+        for obj, manager in managers:
+            tags = [tag if tag.pk else created[tag.name] for tag in manager.tags]
+            for tag in tags:
+                links.append(
+                    through(**{source_attname: obj.pk, target_attname: tag.pk})
+                )
+                model_amounts[tag] = model_amounts.get(tag, 0) + 1
+
+            # Replace the fake manager with a real one holding the saved tags
+            manager = getattr(obj, field.name)
+            manager.tags = tags
+            manager.changed = False
+        through._base_manager.using(using).bulk_create(links)
+
     def get_or_create(self, defaults=None, **kwargs):
         # Get or create object as normal
         safe_fields, singletag_fields, tag_fields = _split_kwargs(self.model, kwargs)
@@ -247,6 +401,202 @@ class TaggedQuerySet(models.query.QuerySet):
         except self.model.DoesNotExist:
             return self.create(**kwargs), True
 
+    def update(self, **kwargs):
+        """
+        Update the objects in the queryset, as for a normal ``update``, but
+        also accept tag names for SingleTagFields, and update their tag counts
+
+        Each SingleTagField costs one query to get or create the new tag, and
+        one aggregate query to find the old tags, and the counts are changed
+        together after the update.
+        """
+        singletag_fields = []
+        for field_name, val in kwargs.items():
+            try:
+                field = self.model._meta.get_field(field_name)
+            except FieldDoesNotExist:
+                continue
+            if (
+                isinstance(field, SingleTagField)
+                and field.name == field_name
+                and (val is None or isinstance(val, (str, field.tag_model)))
+            ):
+                singletag_fields.append(field)
+
+        if not singletag_fields:
+            return super(TaggedQuerySet, self).update(**kwargs)
+
+        using = self._db or router.db_for_write(self.model)
+        with transaction.atomic(using=using):
+            # Count changes as ``{tag_model: {tag: amount}}``
+            amounts = {}
+            for field in singletag_fields:
+                tag = self._get_singletag(field, kwargs[field.name], using)
+                kwargs[field.name] = tag
+                self._count_singletag_update(field, tag, using, amounts)
+
+            rows = super(TaggedQuerySet, self).update(**kwargs)
+            for tag_model, tag_amounts in amounts.items():
+                tag_model.objects.using(using).change_counts(tag_amounts)
+        return rows
+
+    update.alters_data = True
+
+    def _get_singletag(self, field, val, using):
+        """
+        Get or create the tag for a value being set on a SingleTagField, which
+        may be a tag, a tag name, or None
+        """
+        if isinstance(val, field.tag_model) and val.pk:
+            return val
+        if val:
+            name = field.tag_options.normaliser.normalise(str(val))
+            return field.tag_model.objects.using(using).bulk_get_or_create([name])[name]
+        if field.required:
+            raise ValidationError(field.error_messages["null"])
+        return None
+
+    def _count_singletag_update(self, field, tag, using, amounts):
+        """
+        Find the old tags of a SingleTagField on the objects in the queryset,
+        and add the changes for replacing them with ``tag`` to the count changes
+        """
+        if not self.query.can_filter():
+            raise TypeError("Cannot update a query once a slice has been taken.")
+
+        # Count how many objects have each old tag
+        old_counts = dict(
+            self.model._base_manager.using(using)
+            .filter(pk__in=self.order_by().values("pk"))
+            .order_by()
+            .values_list(field.attname)
+            .annotate(models.Count("pk"))
+        )
+        tag_pk = tag.pk if tag else None
+        model_amounts = amounts.setdefault(field.tag_model, {})
+        if tag:
+            added = sum(old_counts.values()) - old_counts.get(tag_pk, 0)
+            model_amounts[tag] = model_amounts.get(tag, 0) + added
+
+        old_pks = [pk for pk in old_counts if pk is not None and pk != tag_pk]
+        for old_tag in field.tag_model.objects.using(using).filter(pk__in=old_pks):
+            model_amounts[old_tag] = (
+                model_amounts.get(old_tag, 0) - old_counts[old_tag.pk]
+            )
+
+    def delete(self):
+        """
+        Delete the objects in the queryset, as for a normal ``delete``, but
+        change the tag counts in bulk instead of for each object
+
+        TagField relationships are counted and deleted together, and the tag
+        counts are changed with one query for each tag model once the objects
+        have been deleted.
+        """
+        # Only tag fields on this model; the signals for parent models will
+        # handle their own fields
+        fields = [
+            (field, field_type)
+            for field, field_type in self.model._meta.__dict__.get(
+                TAGGED_ATTR_FIELDS, ()
+            )
+            if field.model == self.model
+        ]
+
+        # Let Django raise errors for querysets which cannot be deleted
+        if (
+            not fields
+            or not self.query.can_filter()
+            or self.query.distinct
+            or self._fields is not None
+        ):
+            return super(TaggedQuerySet, self).delete()
+
+        using = self._db or router.db_for_write(self.model)
+        with transaction.atomic(using=using, savepoint=False):
+            # Load the objects, as Django needs them for the delete signals
+            qs = self.using(using).order_by().select_related(None)
+            qs = qs.prefetch_related(None)
+            qs._tagulous_prefetch = ()
+            objs = list(qs)
+
+            # Count changes as ``{tag_model: {pk: amount}}``, and the number
+            # of TagField relationships deleted as ``{label: count}``
+            amounts = {}
+            links_deleted = {}
+            for field, field_type in fields:
+                model_amounts = amounts.setdefault(field.tag_model, {})
+                if field_type == SingleTagField:
+                    self._count_deleted_singletags(objs, field, model_amounts)
+                else:
+                    count = self._delete_tagfield(objs, field, using, model_amounts)
+                    if count:
+                        label = field.remote_field.through._meta.label
+                        links_deleted[label] = count
+
+            # The signal handlers don't need to change these counts again
+            for obj in objs:
+                obj.__dict__[TAGGED_ATTR_DELETED] = True
+
+            collector = Collector(using=using)
+            collector.collect(objs)
+            deleted, deleted_by_model = collector.delete()
+            for label, count in links_deleted.items():
+                deleted += count
+                deleted_by_model[label] = deleted_by_model.get(label, 0) + count
+
+            # Tags may now be unused, so check them together
+            for tag_model, tag_amounts in amounts.items():
+                counts.apply_bulk(tag_model, using, tag_amounts)
+
+        self._result_cache = None
+        return deleted, deleted_by_model
+
+    delete.alters_data = True
+    delete.queryset_only = True
+
+    def _count_deleted_singletags(self, objs, field, amounts):
+        """
+        Add decrements to ``{pk: amount}`` for the tags of a SingleTagField on
+        objects which are about to be deleted
+        """
+        for obj in objs:
+            pk = obj.__dict__.get(field.attname)
+            if pk is not None:
+                amounts[pk] = amounts.get(pk, 0) - 1
+
+    def _delete_tagfield(self, objs, field, using, amounts):
+        """
+        Count and delete the TagField relationships of objects which are about
+        to be deleted, and add decrements to ``{pk: amount}`` for their tags
+
+        Each uses one query, unless the database limits the number of objects
+        which can be matched at once, when they will be split into batches.
+
+        Returns the number of relationships deleted.
+        """
+        through, source_name, target_name = self._get_through(field)
+        target_attname = through._meta.get_field(target_name).attname
+        batch_size = max(connections[using].ops.bulk_batch_size([source_name], objs), 1)
+        deleted = 0
+        for i in range(0, len(objs), batch_size):
+            pks = [obj.pk for obj in objs[i : i + batch_size]]
+            links = through._base_manager.using(using).filter(
+                **{"%s__in" % source_name: pks}
+            )
+            batch_deleted = 0
+            for pk, count in (
+                links.order_by()
+                .values_list(target_attname)
+                .annotate(models.Count("pk"))
+            ):
+                amounts[pk] = amounts.get(pk, 0) - count
+                batch_deleted += count
+            if batch_deleted:
+                links._raw_delete(using)
+                deleted += batch_deleted
+        return deleted
+
     @classmethod
     def cast_class(cls, queryset):
         """
@@ -292,6 +642,377 @@ class TaggedQuerySet(models.query.QuerySet):
 
         return similar
 
+    def prefetch_tags(self, *field_names):
+        """
+        Load the tags for the specified tag fields when the queryset is
+        evaluated, and use them to fill the tag caches on each instance.
+
+        Each TagField costs one query, and each SingleTagField costs one query.
+
+        Arguments:
+            field_names     Names of the tag fields to load. If none are given,
+                            all tag fields on the model will be loaded.
+        """
+        if field_names:
+            fields = [
+                self._get_tag_field(field_name, BaseTagField, "prefetch tags for")
+                for field_name in field_names
+            ]
+        else:
+            fields = singletagfields_from_model(self.model) + tagfields_from_model(
+                self.model
+            )
+
+        qs = self._chain()
+        qs._tagulous_prefetch = tuple(qs._tagulous_prefetch) + tuple(
+            field for field in fields if field not in qs._tagulous_prefetch
+        )
+        return qs
+
+    def _prefetch_tags_objects(self):
+        """
+        Load the tags for the fields in _tagulous_prefetch into the tag caches
+        of the instances in the result cache
+        """
+        instances = self._result_cache
+        if not instances:
+            return
+
+        for field in self._tagulous_prefetch:
+            if isinstance(field, SingleTagField):
+                self._prefetch_singletags(instances, field)
+            else:
+                self._prefetch_tags(instances, field)
+
+    def _prefetch_singletags(self, instances, field):
+        """
+        Load the tags for a SingleTagField with one query
+        """
+        target = field.target_field
+        values = set(
+            instance.__dict__.get(field.attname)
+            for instance in instances
+            if instance.__dict__.get(field.attname) is not None
+        )
+        tags = {}
+        if values:
+            tag_qs = field.remote_field.model._base_manager.using(self.db)
+            tags = {
+                getattr(tag, target.attname): tag
+                for tag in tag_qs.filter(**{"%s__in" % target.name: values})
+            }
+
+        descriptor = getattr(self.model, field.name)
+        for instance in instances:
+            if field.attname not in instance.__dict__:
+                # Deferred
+                continue
+            value = instance.__dict__[field.attname]
+            if value is not None and value not in tags:
+                # Tag has gone; leave the manager to find out
+                continue
+
+            # Put the tag in the FK cache so a new manager doesn't look it up
+            tag = tags.get(value)
+            field.set_cached_value(instance, tag)
+            descriptor.get_manager(instance).load_tag(tag)
+
+    def _prefetch_tags(self, instances, field):
+        """
+        Load the tags for a TagField with one query on its through model
+        """
+        through = field.remote_field.through
+        source_name = field.m2m_field_name()
+        source_attname = through._meta.get_field(source_name).attname
+        target_name = field.m2m_reverse_field_name()
+
+        # Sort the tags the same way the related manager would
+        ordering = []
+        for order in field.remote_field.model._meta.ordering:
+            if isinstance(order, str):
+                desc = "-" if order.startswith("-") else ""
+                ordering.append("%s%s__%s" % (desc, target_name, order.lstrip("-")))
+
+        rows = (
+            through._base_manager.using(self.db)
+            .filter(**{"%s__in" % source_name: [obj.pk for obj in instances]})
+            .select_related(target_name)
+            .order_by(*ordering)
+        )
+        tags = {}
+        for row in rows:
+            tags.setdefault(getattr(row, source_attname), []).append(
+                getattr(row, target_name)
+            )
+
+        for instance in instances:
+            manager = getattr(instance, field.name)
+            if not manager.changed:
+                manager.tags = tags.get(instance.pk, [])
+
+    def add_tags(self, field_name, tags):
+        """
+        Add tags to a TagField on every object in the queryset, in bulk
+
+        Arguments:
+            field_name  Name of the TagField
+            tags        Tag string, or list of tag names or tags
+
+        Tags are added with one query, and their counts updated with another.
+        Objects which already have a tag will not have it added again.
+
+        No model or m2m signals are sent, and any instances already in memory
+        will not know about the change until they are reloaded.
+        """
+        field = self._get_tag_field(field_name, TagField, "add tags to")
+        using = self._db or router.db_for_write(self.model)
+        with transaction.atomic(using=using):
+            tags = self._get_tags(field, tags, using, create=True)
+            self._check_max_count(field, tags, using)
+            amounts = self._add_tags(field, tags, using)
+            field.tag_model.objects.using(using).change_counts(amounts)
+
+    add_tags.alters_data = True
+
+    def remove_tags(self, field_name, tags):
+        """
+        Remove tags from a TagField on every object in the queryset, in bulk
+
+        Arguments:
+            field_name  Name of the TagField
+            tags        Tag string, or list of tag names or tags
+
+        Tags are removed with one query, and their counts updated with
+        another. Tags which are no longer in use will be deleted.
+
+        As with ``add_tags``, no signals are sent.
+        """
+        field = self._get_tag_field(field_name, TagField, "remove tags from")
+        using = self._db or router.db_for_write(self.model)
+        with transaction.atomic(using=using):
+            tags = self._get_tags(field, tags, using)
+            if not tags:
+                return
+            removed = self._remove_tags(field, using, include=tags)
+            field.tag_model.objects.using(using).change_counts(
+                {tag: -removed.get(tag.pk, 0) for tag in tags}
+            )
+
+    remove_tags.alters_data = True
+
+    def set_tags(self, field_name, tags):
+        """
+        Set the tags of a TagField on every object in the queryset, in bulk
+
+        Arguments:
+            field_name  Name of the TagField
+            tags        Tag string, or list of tag names or tags
+
+        Other tags are removed with one query, missing tags are added with
+        another, and all their counts are updated together.
+
+        As with ``add_tags``, no signals are sent.
+        """
+        field = self._get_tag_field(field_name, TagField, "set tags on")
+        using = self._db or router.db_for_write(self.model)
+        with transaction.atomic(using=using):
+            tags = self._get_tags(field, tags, using, create=True)
+            self._check_max_count(field, tags)
+            removed = self._remove_tags(field, using, exclude=tags)
+            amounts = self._add_tags(field, tags, using)
+            if removed:
+                tag_qs = field.tag_model.objects.using(using)
+                for tag in tag_qs.filter(pk__in=removed):
+                    amounts[tag] = -removed[tag.pk]
+            field.tag_model.objects.using(using).change_counts(amounts)
+
+    set_tags.alters_data = True
+
+    def _get_tag_field(self, field_name, field_class, action):
+        """
+        Return the field with the specified name, or raise a ValueError if it
+        is not an instance of ``field_class``
+        """
+        field = self.model._meta.get_field(field_name)
+        if not isinstance(field, field_class):
+            raise ValueError(
+                "Cannot %s %s: it is not a %s"
+                % (
+                    action,
+                    field_name,
+                    "TagField" if field_class is TagField else "tag field",
+                )
+            )
+        return field
+
+    def _get_tags(self, field, tags, using, create=False):
+        """
+        Return a list of tags for a TagField from a tag string, or a list of
+        tag names or tags, with each tag only listed once
+
+        If create is True, missing tags will be created, otherwise they will
+        be left out
+        """
+        tag_options = field.tag_options
+        if isinstance(tags, str):
+            tags = utils.parse_tags(tags, space_delimiter=tag_options.space_delimiter)
+        names = [tag_options.normaliser.normalise(str(tag)) for tag in tags]
+
+        tag_qs = field.tag_model.objects.using(using)
+        if create:
+            found = tag_qs.bulk_get_or_create(names).values()
+        else:
+            found = tag_qs.filter_names(names)
+
+        unique = {}
+        for tag in found:
+            unique.setdefault(tag.pk, tag)
+        return list(unique.values())
+
+    def _check_max_count(self, field, tags, using=None):
+        """
+        Raise a ValueError if the tags would take any object over the field's
+        max_count
+
+        If ``using`` is set, the tags will be added to the objects' existing
+        tags, so they will be counted too.
+        """
+        max_count = field.tag_options.max_count
+        if not max_count:
+            return
+
+        too_many = len(tags) > max_count
+        if not too_many and using is not None:
+            # Look for objects with too many other tags
+            through, source_name, target_name = self._get_through(field)
+            too_many = (
+                through._base_manager.using(using)
+                .filter(**{"%s__in" % source_name: self._get_tagged_pks()})
+                .exclude(**{"%s__in" % target_name: tags})
+                .order_by()
+                .values(source_name)
+                .annotate(_tagulous_count=models.Count("pk"))
+                .filter(_tagulous_count__gt=max_count - len(tags))
+                .exists()
+            )
+        if too_many:
+            raise ValueError("Cannot set more than %d tags on this field" % max_count)
+
+    def _get_through(self, field):
+        """
+        Return the through model of a TagField, with the names of its fields
+        which refer to the tagged model and the tag model
+        """
+        return (
+            field.remote_field.through,
+            field.m2m_field_name(),
+            field.m2m_reverse_field_name(),
+        )
+
+    def _get_tagged_pks(self):
+        """
+        Return a subquery for the pks of the objects in the queryset
+        """
+        if not self.query.can_filter():
+            raise TypeError("Cannot change tags once a slice has been taken.")
+        return self.order_by().values("pk")
+
+    def _add_tags(self, field, tags, using):
+        """
+        Add tags to the objects in the queryset which do not already have them,
+        with a single ``INSERT ... SELECT``
+
+        Returns a dict of ``{tag: count}`` for the number of objects each tag
+        was added to
+        """
+        if not tags:
+            return {}
+        through, source_name, target_name = self._get_through(field)
+        target_attname = through._meta.get_field(target_name).attname
+        pks = self._get_tagged_pks()
+        objs = self.model._base_manager.using(using).filter(pk__in=pks)
+
+        # Find how many objects each tag will be added to
+        total = objs.count()
+        existing = dict(
+            through._base_manager.using(using)
+            .filter(**{"%s__in" % source_name: pks, "%s__in" % target_name: tags})
+            .order_by()
+            .values_list(target_attname)
+            .annotate(models.Count("pk"))
+        )
+        amounts = {tag: total - existing.get(tag.pk, 0) for tag in tags}
+
+        # Insert every (object, tag) pair which does not exist yet, by joining
+        # the objects to the tags
+        tag_pks = [tag.pk for tag, amount in amounts.items() if amount]
+        if not tag_pks:
+            return amounts
+        obj_sql, obj_params = (
+            objs.order_by()
+            .values(_tagulous_obj=models.F("pk"))
+            .query.get_compiler(using)
+            .as_sql()
+        )
+        tag_sql, tag_params = (
+            field.tag_model._base_manager.using(using)
+            .filter(pk__in=tag_pks)
+            .order_by()
+            .values(_tagulous_tag=models.F("pk"))
+            .query.get_compiler(using)
+            .as_sql()
+        )
+
+        connection = connections[using]
+        qn = connection.ops.quote_name
+        sql = (
+            "INSERT INTO {table} ({source}, {target}) "
+            "SELECT objs.{obj}, tags.{tag} FROM ({obj_sql}) objs, ({tag_sql}) tags "
+            "WHERE NOT EXISTS (SELECT 1 FROM {table} links "
+            "WHERE links.{source} = objs.{obj} AND links.{target} = tags.{tag})"
+        ).format(
+            table=qn(through._meta.db_table),
+            source=qn(through._meta.get_field(source_name).column),
+            target=qn(through._meta.get_field(target_name).column),
+            obj=qn("_tagulous_obj"),
+            tag=qn("_tagulous_tag"),
+            obj_sql=obj_sql,
+            tag_sql=tag_sql,
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, tuple(obj_params) + tuple(tag_params))
+        return amounts
+
+    def _remove_tags(self, field, using, include=None, exclude=None):
+        """
+        Remove tags from the objects in the queryset with a single ``DELETE``
+
+        Arguments:
+            include     If set, only remove these tags
+            exclude     If set, remove all tags except these
+
+        Returns a dict of ``{tag pk: count}`` for the number of objects each
+        tag was removed from
+        """
+        through, source_name, target_name = self._get_through(field)
+        links = through._base_manager.using(using).filter(
+            **{"%s__in" % source_name: self._get_tagged_pks()}
+        )
+        if include is not None:
+            links = links.filter(**{"%s__in" % target_name: include})
+        if exclude:
+            links = links.exclude(**{"%s__in" % target_name: exclude})
+
+        # Count the links for each tag before deleting them
+        removed = dict(
+            links.order_by()
+            .values_list(through._meta.get_field(target_name).attname)
+            .annotate(models.Count("pk"))
+        )
+        if removed:
+            links._raw_delete(using)
+        return removed
+
 
 # ##############################################################################
 # ############################################################## TaggedManager
@@ -337,6 +1058,18 @@ class TaggedManager(models.Manager):
     def similarly_tagged(self, instance, field_name):
         return self.get_queryset().similarly_tagged(instance, field_name)
 
+    def prefetch_tags(self, *field_names):
+        return self.get_queryset().prefetch_tags(*field_names)
+
+    def add_tags(self, field_name, tags):
+        return self.get_queryset().add_tags(field_name, tags)
+
+    def remove_tags(self, field_name, tags):
+        return self.get_queryset().remove_tags(field_name, tags)
+
+    def set_tags(self, field_name, tags):
+        return self.get_queryset().set_tags(field_name, tags)
+
 
 # ##############################################################################
 # ############################################################## TaggedModel
@@ -66,6 +66,32 @@ WEIGHT_MIN = getattr(settings, "TAGULOUS_WEIGHT_MIN", 1)
 WEIGHT_MAX = getattr(settings, "TAGULOUS_WEIGHT_MAX", 6)
 
 
+#
+# Tag string parse and render caches
+#
+
+# Maximum number of results to keep in the LRU caches for parse_tags and
+# render_tags. Set to 0 to disable the caches.
+PARSE_CACHE_SIZE = getattr(settings, "TAGULOUS_PARSE_CACHE_SIZE", 0)
+
+# Tag strings longer than this will not be cached, so large one-off values
+# cannot fill the cache
+PARSE_CACHE_MAX_LENGTH = getattr(settings, "TAGULOUS_PARSE_CACHE_MAX_LENGTH", 1024)
+
+
+#
+# Tag counts
+#
+
+# Set to True to collect changes to tag counts made inside a transaction, and
+# apply them together when it commits
+DEFER_COUNTS = getattr(settings, "TAGULOUS_DEFER_COUNTS", False)
+
+# Set to False to leave unused tags in the database when their counts reach 0,
+# so they can be deleted later in bulk by the tagulous_gc management command
+DELETE_INLINE = getattr(settings, "TAGULOUS_DELETE_INLINE", True)
+
+
 #
 # Feature flags
 #
@@ -4,8 +4,8 @@ Model signal handlers
 These are connected in tagulous.apps.TagulousConfig.ready()
 """
 
+from ..constants import TAGGED_ATTR_DELETED, TAGGED_ATTR_FIELDS
 from ..models.fields import SingleTagField, TagField
-from ..models.tagged import TaggedModel
 
 
 class TaggedSignalHandler(object):
@@ -13,28 +13,75 @@ class TaggedSignalHandler(object):
     Base class handling signals from TaggedModel subclasses
     """
 
+    # If True, skip tag fields which have not been read or written, so have no
+    # manager on the instance
+    skip_untouched = False
+
+    # If True, skip instances being deleted by TaggedQuerySet.delete(), which
+    # has already changed their tag counts
+    skip_deleted = False
+
     def __call__(self, sender, instance, **kwargs):
-        if not self.is_relevant(sender):
+        # Models without tag fields will return after a dict lookup
+        fields = self.get_fields(sender)
+        if not fields:
             return
 
-        for field, field_type in self.get_fields(sender):
+        if self.skip_deleted and instance.__dict__.get(TAGGED_ATTR_DELETED):
+            return
+
+        is_raw = kwargs.get("raw", False)
+        update_fields = kwargs.get("update_fields")
+        for field, field_type in fields:
+            # Skip SingleTagFields which are not being saved. Django fills in
+            # update_fields itself when saving a deferred instance, and never
+            # lists m2m fields, so TagFields are always saved.
+            if (
+                update_fields is not None
+                and field_type == SingleTagField
+                and not (field.name in update_fields or field.attname in update_fields)
+            ):
+                continue
+
+            if (
+                self.skip_untouched
+                and not is_raw
+                and self.is_untouched(instance, field, field_type)
+            ):
+                continue
+
             descriptor = getattr(sender, field.name)
             manager = descriptor.get_manager(instance)
 
-            self.handle(manager, field_type, kwargs.get("raw", False))
+            self.handle(manager, field_type, is_raw)
+
+    def is_untouched(self, instance, field, field_type):
+        """
+        Return True if the tag field has not been read or written on this
+        instance, so there are no changes for the manager to handle
+        """
+        if getattr(instance, field.get_manager_name(), None) is not None:
+            return False
+
+        # A required SingleTagField without a value still needs validating
+        if (
+            field_type == SingleTagField
+            and field.required
+            and field.attname in instance.__dict__
+            and instance.__dict__[field.attname] is None
+        ):
+            return False
 
-    def is_relevant(self, sender):
-        return issubclass(sender, TaggedModel)
+        return True
 
     def get_fields(self, sender):
         """
-        Generator which returns (field, field_type) pairs
+        Return a list of (field, field_type) pairs
+
+        These are found when the model is prepared; see
+        ``tagulous.signals.pre.tag_fields_listener``
         """
-        for field in sender._meta.get_fields():
-            if isinstance(field, SingleTagField):
-                yield (field, SingleTagField)
-            elif isinstance(field, TagField):
-                yield (field, TagField)
+        return sender._meta.__dict__.get(TAGGED_ATTR_FIELDS, ())
 
     def handle(self, manager, field_type, is_raw):
         raise NotImplementedError()  # pragma: no cover
@@ -49,6 +96,8 @@ class PreSaveHandler(TaggedSignalHandler):
     assign its pk to field_id.
     """
 
+    skip_untouched = True
+
     def handle(self, manager, field_type, is_raw):
         if field_type != SingleTagField:
             return
@@ -62,6 +111,8 @@ class PostSaveHandler(TaggedSignalHandler):
     Ensure both tag fields' states are saved
     """
 
+    skip_untouched = True
+
     def handle(self, manager, field_type, is_raw):
         manager.post_save_handler()
 
@@ -82,10 +133,13 @@ class PropagatedSignalMixin(object):
         Post delete signal propagates up the class hierarchy, so filter fields
         returned to those belonging to the model which raised this signal
         """
-        for field, field_type in super(PropagatedSignalMixin, self).get_fields(sender):
-            if field.model != sender:
-                continue
-            yield (field, field_type)
+        return [
+            (field, field_type)
+            for field, field_type in super(PropagatedSignalMixin, self).get_fields(
+                sender
+            )
+            if field.model == sender
+        ]
 
 
 class PreDeleteHandler(PropagatedSignalMixin, TaggedSignalHandler):
@@ -95,6 +149,8 @@ class PreDeleteHandler(PropagatedSignalMixin, TaggedSignalHandler):
     Ensure TagField is cleaned out before the main object is deleted
     """
 
+    skip_deleted = True
+
     def handle(self, manager, field_type, is_raw):
         if field_type != TagField:
             return
@@ -108,6 +164,8 @@ class PostDeleteHandler(PropagatedSignalMixin, TaggedSignalHandler):
     Update tag count on delete
     """
 
+    skip_deleted = True
+
     def handle(self, manager, field_type, is_raw):
         if field_type != SingleTagField:
             return
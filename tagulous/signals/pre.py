@@ -7,6 +7,13 @@ INSTALLED_APPS can have their models enhanced.
 from django.db.models.signals import class_prepared
 
 from .. import settings
+from ..constants import TAGGED_ATTR_FIELDS
+from ..models.fields import (
+    SingleTagField,
+    TagField,
+    singletagfields_from_model,
+    tagfields_from_model,
+)
 from ..models.tagged import TaggedModel
 
 
@@ -18,9 +25,28 @@ def class_prepared_listener(sender, **kwargs):
     TaggedModel.cast_class(sender)
 
 
+def tag_fields_listener(sender, **kwargs):
+    """
+    Listen to the class_prepared signal and store a list of the tag fields on
+    tagged models, for the model signal handlers in tagulous.signals.post
+    """
+    if not issubclass(sender, TaggedModel):
+        return
+
+    setattr(
+        sender._meta,
+        TAGGED_ATTR_FIELDS,
+        [(field, SingleTagField) for field in singletagfields_from_model(sender)]
+        + [(field, TagField) for field in tagfields_from_model(sender)],
+    )
+
+
 def register_pre_signals():
     """
     Called from tagulous/models/__init__.py
     """
     if settings.ENHANCE_MODELS:
         class_prepared.connect(class_prepared_listener, weak=False)
+
+    # Must be connected after class_prepared_listener has cast the model
+    class_prepared.connect(tag_fields_listener, weak=False)
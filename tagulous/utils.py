@@ -3,6 +3,10 @@ Tag parsing and printing
 
 Loosely based on django-taggit and django-tagging
 """
+import re
+from functools import lru_cache
+
+from django.conf import settings as django_settings
 from django.utils.encoding import force_str
 
 from .constants import COMMA, DOUBLE_QUOTE, QUOTE, SPACE, TREE
@@ -30,6 +34,8 @@ def parse_tags(tag_string, max_count=0, space_delimiter=True):
     If space_delimiter is False, space will never be used as a delimiter.
 
     Tree tags can be further split into their parts with split_tree_name
+
+    If TAGULOUS_PARSE_CACHE_SIZE is set, results are memoised in an LRU cache
     """
     # Empty string easiest case
     if not tag_string:
@@ -37,14 +43,59 @@ def parse_tags(tag_string, max_count=0, space_delimiter=True):
 
     tag_string = force_str(tag_string)
 
-    # Prep variables for the parser
-    tags = []
-    tag = ""
-    delimiter = SPACE
-    in_quote = None
-    chars = False
+    # Look up in the cache, if enabled
+    if not _caches_configured:
+        _configure_caches_from_settings()
+    if _parse_cache is not None and len(tag_string) <= _cache_max_length:
+        tags = list(_parse_cache(tag_string, space_delimiter))
+        if max_count and len(tags) > max_count:
+            raise _max_count_error(max_count)
+        return tags
+
+    # Enforce uniqueness as tags are found, so that we can stop parsing as
+    # soon as there are too many
+    tags = set()
+    for tag in iter_tags(tag_string, space_delimiter):
+        tags.add(tag)
+        if max_count and len(tags) > max_count:
+            raise _max_count_error(max_count)
+
+    return sorted(tags)
+
+
+def _parse_tags(tag_string, space_delimiter):
+    """
+    Parse a tag string into a sorted list of unique tag names
+    """
+    return sorted(set(iter_tags(tag_string, space_delimiter)))
+
+
+def _max_count_error(max_count):
+    return ValueError(
+        "This field can only have %s argument%s"
+        % (max_count, "" if max_count == 1 else "s")
+    )
+
+
+def iter_tags(tag_string, space_delimiter=True):
+    """
+    Generator which yields tag names from a tag string as they are found
+
+    Follows the same rules as parse_tags, but tags are yielded in the order
+    they appear in the string, and may include duplicates.
+
+    Tags which would be merged together if an unquoted comma appeared later in
+    the string are held back until the parser knows the delimiter cannot
+    change; otherwise each tag is yielded as soon as it ends.
+    """
+    # Empty string easiest case
+    if not tag_string:
+        return
+
+    tag_string = force_str(tag_string)
 
     # Disable spaces
+    delimiter = SPACE
     if not space_delimiter:
         delimiter = COMMA
 
@@ -60,15 +111,94 @@ def parse_tags(tag_string, max_count=0, space_delimiter=True):
             delimiter = SPACE
 
         # Split and strip tags
-        tags = split_strip(tag_string, delimiter)
+        yield from _iter_split_strip(tag_string, delimiter)
 
     else:
-        # Break tag string into list of (index, char)
-        chars = list(enumerate(tag_string))
+        yield from _iter_quoted(tag_string, delimiter)
 
-    # Loop through chars
-    while chars:
-        index, char = chars.pop(0)
+
+def parse_tags_many(tag_strings, max_count=0, space_delimiter=True):
+    """
+    Parse an iterable of tag strings in one call
+
+    Each unique tag string is only parsed once, so repeated values (common in
+    bulk imports) are cheap.
+
+    Returns a tuple of ``(parsed, names)``, where ``parsed`` is a list
+    containing the sorted list of unique tag names for each tag string, in the
+    same order as ``tag_strings``, and ``names`` is a set of every tag name
+    seen across all tag strings.
+
+    Arguments are as for parse_tags, and are applied to each tag string.
+    """
+    parsed = []
+    names = set()
+    seen = {}
+    for tag_string in tag_strings:
+        tags = seen.get(tag_string)
+        if tags is None:
+            tags = parse_tags(tag_string, max_count, space_delimiter)
+            seen[tag_string] = tags
+            names.update(tags)
+
+        # Give each row its own list so callers can change them safely
+        parsed.append(list(tags))
+
+    return parsed, names
+
+
+def _iter_split_strip(tag_string, delimiter):
+    """
+    Generator version of split_strip, for a non-empty string
+    """
+    start = 0
+    while True:
+        end = tag_string.find(delimiter, start)
+        if end == -1:
+            tag = tag_string[start:].strip()
+        else:
+            tag = tag_string[start:end].strip()
+        if tag:
+            yield tag
+        if end == -1:
+            return
+        start = end + 1
+
+
+# Matches the rest of a tag string which can be split on spaces without meeting
+# an unquoted comma: a series of unquoted tags without commas, and quoted tags
+# which close before a space. It does not match every such string; when it
+# doesn't match, the parser can't tell until it reaches the end.
+_SPACE_ONLY_RE = re.compile(r' *(?:(?:[^ ,"][^ ,]*|"[^"][^"]*(?:""[^"]*)*")(?: +|\Z))*')
+
+
+def _iter_quoted(tag_string, delimiter):
+    """
+    Parse a tag string which contains quotes
+
+    Single pass over the string by index. The tag being built is held as a
+    list of non-empty fragments, so it is only joined when it is complete.
+
+    Generator which yields tags as they are found, which may contain
+    duplicates
+    """
+    # While space is the delimiter, an unquoted comma later in the string
+    # will merge all previous tags into one. Hold tags back in pending until
+    # we are past the last comma in the string, or the delimiter has changed.
+    # If there are commas, check once whether they are all safely quoted, so
+    # that we don't have to parse the whole string before yielding.
+    pending = []
+    last_comma = tag_string.rfind(COMMA) if delimiter == SPACE else -1
+    checked = False
+
+    tag = []
+    in_quote = None
+    length = len(tag_string)
+    index = 0
+
+    while index < length:
+        char = tag_string[index]
+        index += 1
 
         # See if it's a delimiter
         if not in_quote:
@@ -77,50 +207,31 @@ def parse_tags(tag_string, max_count=0, space_delimiter=True):
                 delimiter = COMMA
 
                 # All previous tags were actually just one tag
-                tag = tag_string[0:index].strip()
-                tags = []
-
-                # Strip start/end quotes
-                tag_len = len(tag)
-                tag = tag.lstrip(QUOTE)
-                left_quote_count = tag_len - len(tag)
-                tag_len = len(tag)
-                tag = tag.rstrip(QUOTE)
-                right_quote_count = tag_len - len(tag)
-
-                # Escape inner quotes
-                tag = tag.replace(DOUBLE_QUOTE, QUOTE)
-
-                # Add back escaped start/end quotes
-                tag = (
-                    (QUOTE * int(left_quote_count / 2))
-                    + tag
-                    + (QUOTE * int(right_quote_count / 2))
-                )
-
-                # Add back insignificant unescaped quotes.
-                #
-                # There are only two scenarios where there can be unescaped
-                # quotes at the start, followed by a comma later:
-                #   1. The comma is quoted - but that means in_quote is True,
-                #      in which case we won't be in this code branch
-                #   2. The comma comes after a matching closing unescaped quote
-                #
-                # Therefore there can't be insigificant unescaped quotes on the
-                # left and unescaped quotes on the right are only insignificant
-                # if there are no unescaped quotes on the left
-                if right_quote_count % 2 == 1 and left_quote_count % 2 == 0:
-                    tag += QUOTE
+                pending = []
+                tag = _requote(tag_string[0 : index - 1].strip())
+                tag = [tag] if tag else []
 
             # Found end of tag
             if char == delimiter:
-                tag = tag.rstrip()
-                if tag:
-                    tags.append(tag)
-                    tag = ""
-                # Following tested manually due to coverage bug
-                #   See https://bitbucket.org/ned/coveragepy/issues/198
-                continue  # pragma: no cover
+                name = "".join(tag).rstrip()
+                tag = []
+                if not name:
+                    continue
+
+                if delimiter == SPACE and index <= last_comma and not checked:
+                    checked = True
+                    if _SPACE_ONLY_RE.fullmatch(tag_string, index):
+                        last_comma = -1
+
+                if delimiter == SPACE and index <= last_comma:
+                    pending.append(name)
+                    continue
+
+                if pending:
+                    yield from pending
+                    pending = []
+                yield name
+                continue
 
             # If tag is empty, ignore whitespace
             if not tag and char == SPACE:
@@ -129,14 +240,15 @@ def parse_tags(tag_string, max_count=0, space_delimiter=True):
         # Now either in a quote, or not a delimiter
         # If it's not a quote, add to tag
         if char != QUOTE:
-            tag += char
+            tag.append(char)
             continue
 
         # Char is quote - count how many quotes appear here
         quote_count = 1
-        while chars and chars[0][1] == QUOTE:
+        while index < length and tag_string[index] == QUOTE:
             quote_count += 1
-            chars.pop(0)
+            index += 1
+        escaped = QUOTE * (quote_count // 2)
 
         if not tag:
             # Quote at start
@@ -145,63 +257,97 @@ def parse_tags(tag_string, max_count=0, space_delimiter=True):
                 in_quote = True
 
             # Tag starts with escaped quotes
-            tag = QUOTE * int(quote_count / 2)
-        else:
-            # Quote in middle or at end
-            # Add any escaped
-            tag += QUOTE * int(quote_count / 2)
+            if escaped:
+                tag.append(escaped)
+            continue
 
-            # An odd number followed by a delimiter will mean it has ended
-            # Need to look ahead to figure it out
-            if quote_count % 2 == 1:
+        # Quote in middle or at end
+        # Add any escaped
+        if escaped:
+            tag.append(escaped)
 
-                # If it's the last character, it has closed
-                if len(chars) == 0:
+        # An odd number followed by a delimiter will mean it has ended
+        # Need to look ahead to figure it out
+        if quote_count % 2 == 0:
+            continue
+
+        # If it's the last character, it has closed
+        if index == length:
+            in_quote = False
+            break
+
+        # Skip ahead over any spaces to the next significant character. Each
+        # run of spaces is only scanned here once, so this stays linear.
+        lookahead = index
+        while lookahead < length:
+            next_char = tag_string[lookahead]
+            if next_char == SPACE:
+                if delimiter == SPACE:
+                    # Quotes closed; tag will end next loop
                     in_quote = False
                     break
 
-                for i2, c2 in chars:
-                    if c2 == SPACE:
-                        if delimiter == SPACE:
-                            # Quotes closed; tag will end next loop
-                            in_quote = False
-                            break
-                        else:
-                            # Spaces are insignificant during whitespace
-                            # Tag may continue, keep checking chars
-                            # Following tested manually due to coverage bug
-                            continue  # pragma: no cover
-                    elif c2 == COMMA:
-                        # Quotes closed; tag will end next loop
-                        # Delimiter doesn't matter, comma always wins
-                        in_quote = False
-                        break
-
-                    # Tag has not ended
-                    # Add odd quote to tag and keep building
-                    tag += QUOTE
-                    break
+                # Spaces are insignificant during whitespace
+                # Tag may continue, keep checking chars
+                lookahead += 1
+                continue
+
+            if next_char == COMMA:
+                # Quotes closed; tag will end next loop
+                # Delimiter doesn't matter, comma always wins
+                in_quote = False
+                break
+
+            # Tag has not ended
+            # Add odd quote to tag and keep building
+            tag.append(QUOTE)
+            break
 
-    # Chars expended
+    # Chars expended - the delimiter can no longer change
+    yield from pending
     if tag:
-        # Partial tag remains; add to stack
+        # Partial tag remains
+        tag = "".join(tag)
         if in_quote:
             # Add the quote back to the start - it wasn't significant after all
             tag = QUOTE + tag
-        tags.append(tag)
+        yield tag
 
-    # Enforce uniqueness and sort
-    tags = list(set(tags))
-    tags.sort()
 
-    # Check the count
-    if max_count and len(tags) > max_count:
-        raise ValueError(
-            "This field can only have %s argument%s"
-            % (max_count, "" if max_count == 1 else "s")
-        )
-
-    return tags
+def _requote(tag):
+    """
+    Clean up a tag which was built using a space delimiter, when the parser
+    switches to the comma delimiter
+    """
+    # Strip start/end quotes
+    tag_len = len(tag)
+    tag = tag.lstrip(QUOTE)
+    left_quote_count = tag_len - len(tag)
+    tag_len = len(tag)
+    tag = tag.rstrip(QUOTE)
+    right_quote_count = tag_len - len(tag)
+
+    # Escape inner quotes
+    tag = tag.replace(DOUBLE_QUOTE, QUOTE)
+
+    # Add back escaped start/end quotes
+    tag = (QUOTE * (left_quote_count // 2)) + tag + (QUOTE * (right_quote_count // 2))
+
+    # Add back insignificant unescaped quotes.
+    #
+    # There are only two scenarios where there can be unescaped quotes at the
+    # start, followed by a comma later:
+    #   1. The comma is quoted - but that means in_quote is True, in which case
+    #      we won't be in this code branch
+    #   2. The comma comes after a matching closing unescaped quote
+    #
+    # Therefore there can't be insigificant unescaped quotes on the left and
+    # unescaped quotes on the right are only insignificant if there are no
+    # unescaped quotes on the left
+    if right_quote_count % 2 == 1 and left_quote_count % 2 == 0:
+        tag += QUOTE
+
+    return tag
 
 
 def split_strip(string, delimiter=","):
@@ -223,12 +369,29 @@ def render_tags(tags):
 
     Tag names which contain commas will be quoted, existing quotes will be
     escaped.
+
+    If TAGULOUS_PARSE_CACHE_SIZE is set, results are memoised in an LRU cache
     """
-    names = []
-    for tag in tags:
-        # This will catch a list of Tag objects or tag name strings
-        name = str(tag)
+    # This will catch a list of Tag objects or tag name strings
+    names = tuple(str(tag) for tag in tags)
+
+    # Look up in the cache, if enabled, or render directly
+    if not _caches_configured:
+        _configure_caches_from_settings()
+    if (
+        _render_cache is not None
+        and sum(len(name) for name in names) <= _cache_max_length
+    ):
+        return _render_cache(names)
+    return _render_tags(names)
 
+
+def _render_tags(tag_names):
+    """
+    Render a tuple of tag name strings into a tag string
+    """
+    names = []
+    for name in tag_names:
         name = name.replace(QUOTE, DOUBLE_QUOTE)
         if COMMA in name or SPACE in name:
             names.append('"%s"' % name)
@@ -237,6 +400,90 @@ def render_tags(tags):
     return ", ".join(sorted(names))
 
 
+# ##############################################################################
+# ###### Tag name parse and render caches
+# ##############################################################################
+
+# Caches are built from settings by configure_caches() on first use, so that
+# this module can be imported without Django settings being configured
+_caches_configured = False
+_parse_cache = None
+_render_cache = None
+_cache_max_length = 0
+
+
+def _parse_tags_tuple(tag_string, space_delimiter):
+    "Parse a tag string into an immutable tuple, for the parse cache"
+    return tuple(_parse_tags(tag_string, space_delimiter))
+
+
+def configure_caches(size=None, max_length=None):
+    """
+    Build new LRU caches for parse_tags and render_tags, discarding any
+    existing cached values and counters.
+
+    Arguments default to the TAGULOUS_PARSE_CACHE_SIZE and
+    TAGULOUS_PARSE_CACHE_MAX_LENGTH settings. A size of 0 disables the caches.
+
+    Called automatically the first time tags are parsed or rendered.
+    """
+    global _caches_configured, _parse_cache, _render_cache, _cache_max_length
+
+    if size is None or max_length is None:
+        from . import settings
+
+        if size is None:
+            size = settings.PARSE_CACHE_SIZE
+        if max_length is None:
+            max_length = settings.PARSE_CACHE_MAX_LENGTH
+
+    _caches_configured = True
+    _cache_max_length = max_length
+    if size:
+        # Cache tuples so cached values can never be changed by callers
+        _parse_cache = lru_cache(maxsize=size)(_parse_tags_tuple)
+        _render_cache = lru_cache(maxsize=size)(_render_tags)
+    else:
+        _parse_cache = None
+        _render_cache = None
+
+
+def _configure_caches_from_settings():
+    """
+    Configure the caches from settings, if Django settings are available.
+
+    Otherwise leave the caches disabled, and try again on the next call.
+    """
+    if django_settings.configured:
+        configure_caches()
+
+
+def cache_info():
+    """
+    Return a dict of cache statistics for the ``parse_tags`` and
+    ``render_tags`` caches, as ``functools`` ``CacheInfo`` named tuples with
+    the attributes ``hits``, ``misses``, ``maxsize`` and ``currsize``.
+
+    If caching is disabled, the values will be None.
+    """
+    if not _caches_configured:
+        _configure_caches_from_settings()
+    return {
+        "parse_tags": _parse_cache.cache_info() if _parse_cache else None,
+        "render_tags": _render_cache.cache_info() if _render_cache else None,
+    }
+
+
+def cache_clear():
+    """
+    Clear the ``parse_tags`` and ``render_tags`` caches and their counters
+    """
+    if _parse_cache is not None:
+        _parse_cache.cache_clear()
+    if _render_cache is not None:
+        _render_cache.cache_clear()
+
+
 # ##############################################################################
 # ###### Tree name split and join
 # ##############################################################################
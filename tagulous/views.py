@@ -43,18 +43,15 @@ def autocomplete(request, tag_model):
 
     # Perform search
     if query:
-        if options.force_lowercase:
-            query = query.lower()
+        normaliser = options.normaliser
+        query = normaliser.normalise(query)
 
         if options.autocomplete_view_fulltext:
             lookup = "contains"
         else:
             lookup = "startswith"
 
-        if not options.case_sensitive:
-            lookup = f"i{lookup}"
-
-        results = queryset.filter(**{f"name__{lookup}": query})
+        results = queryset.filter(**{normaliser.name_lookup(lookup): query})
 
     else:
         results = queryset.all()
@@ -538,3 +538,27 @@ class CustomTagBaseTest(models.Model):
     singletag = tagulous.models.SingleTagField(
         to_base=CustomTagBase, blank=True, related_name="custom_singletag"
     )
+
+
+class ShardedTagModel(tagulous.models.TagModel):
+    """
+    A tag model with count shards
+    """
+
+    class TagMeta:
+        count_shards = 4
+
+
+class ShardedTest(models.Model):
+    """
+    For testing count shards
+    """
+
+    name = models.CharField(max_length=10)
+    singletag = tagulous.models.SingleTagField(
+        ShardedTagModel, blank=True, related_name="sharded_singletag"
+    )
+    tags = tagulous.models.TagField(
+        ShardedTagModel, blank=True, related_name="sharded_tags"
+    )
+    tree = tagulous.models.TagField(tree=True, count_shards=2, blank=True)
@@ -28,6 +28,7 @@ def clear_django():
         # Tagulous models
         "tagulous_migrationtestmodel_singletag",
         "tagulous_migrationtestmodel_tags",
+        "tagulous_migrationtestmodel_tags_count_shards",
         # Django through models
         "migrationtestmodel_tags",
     ]
@@ -115,3 +116,24 @@ def set_model_tree():
         model.tags.tag_model, tagulous.models.models.TagModel
     ), "Tag model not TagModel"
     return model
+
+
+def set_model_sharded():
+    "Tagged model with count shards on the tags field"
+    clear_django()
+    model = type(
+        str("MigrationTestModel"),
+        (models.Model,),
+        {
+            "__module__": "tests.tagulous_tests_migration.models",
+            "name": models.CharField(max_length=10),
+            "tags": tagulous.models.TagField(tree=True, count_shards=2),
+        },
+    )
+
+    # Just confirm dynamic creation worked as expected
+    assert issubclass(model, tagulous.models.tagged.TaggedModel), "Model is not tagged"
+    assert (
+        model.tags.tag_model.count_shard_model is not None
+    ), "Tag model has no count shard model"
+    return model
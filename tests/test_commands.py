@@ -3,10 +3,14 @@ Tagulous test: manage.py commands
 
 Modules tested:
     tagulous.management.commands.initial_tags
+    tagulous.management.commands.tagulous_recount
+    tagulous.management.commands.tagulous_gc
 """
 from django.core.management import call_command
+from django.core.management.base import CommandError
 from django.test import TestCase
 
+from tagulous import settings as tagulous_settings
 from tests.lib import Capturing, TagTestManager
 from tests.tagulous_tests_app import models as test_models
 from tests.tagulous_tests_app2 import models as test_models2
@@ -161,3 +165,246 @@ class InitialTagsTest(TagTestManager, TestCase):
         output = self.run_command(field)
         self.assertSequenceEqual(output, ["Nothing to load for %s" % field])
         self.assertModelsEmpty()
+
+
+# ##############################################################################
+# ###### ./manage.py tagulous_recount
+# ##############################################################################
+
+
+class RecountTest(TagTestManager, TestCase):
+    """
+    Test tagulous_recount command
+    """
+
+    manage_models = [test_models.MixedTest, test_models.MixedRefTest]
+
+    def setUpExtra(self):
+        self.tag_model = test_models.MixedTestTagModel
+        self.model1 = test_models.MixedTest
+        self.model2 = test_models.MixedRefTest
+        self.model1.objects.create(name="Test 1", singletag="blue", tags="blue, red")
+        self.model1.objects.create(name="Test 2", singletag="red", tags="green")
+        self.model2.objects.create(name="Test 3", singletag="blue", tags="blue")
+        self.expected = {"blue": 4, "red": 2, "green": 1}
+
+    def break_counts(self):
+        self.tag_model.objects.filter(name="blue").update(count=10)
+        self.tag_model.objects.filter(name="green").update(count=0)
+
+    def run_command(self, target="", **kwargs):
+        with Capturing() as output:
+            call_command("tagulous_recount", target=target, verbosity=1, **kwargs)
+
+        if DISPLAY_CALL_COMMAND:
+            print(">> tagulous_recount target=%s" % target)
+            print("\n".join(output))
+            print("<<<<<<<<<<")
+
+        return output
+
+    def test_setup(self):
+        self.assertTagModel(self.tag_model, self.expected)
+
+    def test_recount_all(self):
+        "Check no target recounts all tag models"
+        self.break_counts()
+        output = self.run_command()
+        self.assertIn("Recounted 2 tags for tagulous_tests_app.MixedTestTagModel", output)
+        self.assertTagModel(self.tag_model, self.expected)
+
+    def test_recount_model(self):
+        "Check app and model target recounts the tag models for its fields"
+        self.break_counts()
+        output = self.run_command("tagulous_tests_app.MixedTest")
+        self.assertSequenceEqual(
+            output, ["Recounted 2 tags for tagulous_tests_app.MixedTestTagModel"]
+        )
+        self.assertTagModel(self.tag_model, self.expected)
+
+    def test_recount_tag_model(self):
+        "Check a tag model can be targeted directly"
+        self.break_counts()
+        output = self.run_command("tagulous_tests_app.MixedTestTagModel")
+        self.assertSequenceEqual(
+            output, ["Recounted 2 tags for tagulous_tests_app.MixedTestTagModel"]
+        )
+        self.assertTagModel(self.tag_model, self.expected)
+
+    def test_recount_field(self):
+        "Check app, model and field target recounts the field's tag model"
+        self.break_counts()
+        output = self.run_command("tagulous_tests_app.MixedRefTest.tags")
+        self.assertSequenceEqual(
+            output, ["Recounted 2 tags for tagulous_tests_app.MixedTestTagModel"]
+        )
+        self.assertTagModel(self.tag_model, self.expected)
+
+    def test_recount_unused(self):
+        "Check a tag which is not used is counted as 0"
+        self.tag_model.objects.create(name="pink", count=3)
+        self.run_command("tagulous_tests_app.MixedTest")
+        self.assertTagModel(self.tag_model, dict(self.expected, pink=0))
+
+    def test_chunk_size(self):
+        "Check recount works across several chunks"
+        self.break_counts()
+        self.run_command("tagulous_tests_app.MixedTest", chunk_size=1)
+        self.assertTagModel(self.tag_model, self.expected)
+
+    def test_invalid_target(self):
+        "Check invalid targets raise a CommandError"
+        for target, message in [
+            ("missing_app", "No installed app with label 'missing_app'."),
+            (
+                "tagulous_tests_app.Missing",
+                "App 'tagulous_tests_app' doesn't have a 'Missing' model.",
+            ),
+            (
+                "tagulous_tests_app.MixedTest.missing",
+                "MixedTest has no field named 'missing'",
+            ),
+            (
+                "tagulous_tests_app.MixedTest.name",
+                "tagulous_tests_app.MixedTest.name is not a SingleTagField or "
+                "TagField",
+            ),
+            (
+                "tagulous_tests_app.MixedTest.name.extra",
+                "Invalid target 'tagulous_tests_app.MixedTest.name.extra': "
+                "expected [<app>[.<model>[.<field>]]]",
+            ),
+        ]:
+            with self.assertRaises(CommandError) as cm:
+                self.run_command(target)
+            self.assertEqual(str(cm.exception), message)
+
+    def test_foreign_key_target(self):
+        "Check a ForeignKey to a model which is not a tag model is rejected"
+        with self.assertRaises(CommandError) as cm:
+            self.run_command("tagulous_tests_app.ManyToOneTest.mixed_ref_test")
+        self.assertEqual(
+            str(cm.exception),
+            "tagulous_tests_app.ManyToOneTest.mixed_ref_test is not a "
+            "SingleTagField or TagField",
+        )
+
+    def test_dry_run(self):
+        "Check a dry run reports wrong counts without fixing them"
+        self.break_counts()
+        output = self.run_command("tagulous_tests_app.MixedTest", dry_run=True)
+        self.assertSequenceEqual(
+            output,
+            [
+                "  blue: 10 should be 4",
+                "  green: 0 should be 1",
+                "Found wrong counts on 2 tags for tagulous_tests_app.MixedTestTagModel",
+            ],
+        )
+        self.assertTagModel(self.tag_model, {"blue": 10, "red": 2, "green": 0})
+
+
+# ##############################################################################
+# ###### ./manage.py tagulous_gc
+# ##############################################################################
+
+
+class GcTest(TagTestManager, TestCase):
+    """
+    Test tagulous_gc command
+    """
+
+    manage_models = [test_models.MixedTest, test_models.TreeTest]
+
+    def setUpExtra(self):
+        self.delete_inline = tagulous_settings.DELETE_INLINE
+        tagulous_settings.DELETE_INLINE = False
+        self.tag_model = test_models.MixedTestTagModel
+        self.model = test_models.MixedTest
+
+    def tearDownExtra(self):
+        tagulous_settings.DELETE_INLINE = self.delete_inline
+
+    def run_command(self, target="", **kwargs):
+        with Capturing() as output:
+            call_command("tagulous_gc", target=target, verbosity=1, **kwargs)
+
+        if DISPLAY_CALL_COMMAND:
+            print(">> tagulous_gc target=%s" % target)
+            print("\n".join(output))
+            print("<<<<<<<<<<")
+
+        return output
+
+    def test_inline_delete_disabled(self):
+        "Check tags are not deleted when their count reaches 0"
+        t1 = self.model.objects.create(name="Test 1", singletag="blue", tags="red")
+        t1.singletag = "green"
+        t1.tags = ""
+        t1.save()
+        self.assertTagModel(self.tag_model, {"blue": 0, "green": 1, "red": 0})
+
+    def test_invalid_target(self):
+        "Check an invalid target raises a CommandError and deletes nothing"
+        self.tag_model.objects.create(name="blue")
+        with self.assertRaises(CommandError) as cm:
+            self.run_command("tagulous_tests_app.MixedTest.name")
+        self.assertEqual(
+            str(cm.exception),
+            "tagulous_tests_app.MixedTest.name is not a SingleTagField or TagField",
+        )
+        self.assertTagModel(self.tag_model, {"blue": 0})
+
+    def test_gc_model(self):
+        "Check unused tags are deleted, and used and protected tags are kept"
+        t1 = self.model.objects.create(name="Test 1", singletag="blue", tags="red")
+        self.tag_model.objects.create(name="pink", protected=True)
+        t1.tags = "green"
+        t1.save()
+        self.assertTagModel(
+            self.tag_model, {"blue": 1, "green": 1, "pink": 0, "red": 0}
+        )
+
+        output = self.run_command("tagulous_tests_app.MixedTest")
+        self.assertSequenceEqual(
+            output, ["Deleted 1 unused tag from tagulous_tests_app.MixedTestTagModel"]
+        )
+        self.assertTagModel(self.tag_model, {"blue": 1, "green": 1, "pink": 0})
+
+    def test_gc_wrong_count(self):
+        "Check a tag with a count of 0 which is still in use is not deleted"
+        self.model.objects.create(name="Test 1", singletag="blue")
+        self.tag_model.objects.filter(name="blue").update(count=0)
+        self.run_command("tagulous_tests_app.MixedTest")
+        self.assertTagModel(self.tag_model, {"blue": 0})
+
+    def test_gc_chunk_size(self):
+        "Check gc works across several chunks"
+        t1 = self.model.objects.create(name="Test 1", tags="blue, green, red")
+        t1.tags = ""
+        t1.save()
+        output = self.run_command("tagulous_tests_app.MixedTest", chunk_size=1)
+        self.assertSequenceEqual(
+            output, ["Deleted 3 unused tags from tagulous_tests_app.MixedTestTagModel"]
+        )
+        self.assertTagModel(self.tag_model, {})
+
+    def test_gc_tree(self):
+        "Check unused tree parents are deleted after their children"
+        tag_model = test_models.TreeTest.tags.tag_model
+        t1 = test_models.TreeTest.objects.create(
+            name="Test 1", tags="animal/mammal/cat, animal/bird"
+        )
+        t1.tags = "animal/bird"
+        t1.save()
+        self.assertTagModel(
+            tag_model,
+            {"animal": 0, "animal/bird": 1, "animal/mammal": 0, "animal/mammal/cat": 0},
+        )
+
+        output = self.run_command("tagulous_tests_app.TreeTest.tags", chunk_size=1)
+        self.assertSequenceEqual(
+            output,
+            ["Deleted 2 unused tags from tagulous_tests_app.Tagulous_TreeTest_tags"],
+        )
+        self.assertTagModel(tag_model, {"animal": 0, "animal/bird": 1})
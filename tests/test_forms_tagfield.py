@@ -650,6 +650,15 @@ class ModelFormTagFieldOptionsTest(TagTestManager, TestCase):
             form.errors["max_count"][0], "This field can only have 3 arguments"
         )
 
+    def test_max_count_large(self):
+        "Test form TagField max_count rejects a large tag string"
+        tag_string = ", ".join("tag%d" % i for i in range(100000))
+        form = self.form(data={"max_count": tag_string})
+        self.assertFalse(form.is_valid())
+        self.assertEqual(
+            form.errors["max_count"][0], "This field can only have 3 arguments"
+        )
+
     def text_max_count_1(self):
         "Test form TagField max_count of 1"
         # Mostly just to test grammar of the error message
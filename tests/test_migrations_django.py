@@ -465,3 +465,29 @@ class DjangoMigrationTest(TagTestManager, TransactionTestCase):
     def test_data(self):
         "Test data migration"
         self.migrate_data()
+
+    def test_count_shards(self):
+        "Test a tag model with count shards can be migrated"
+        model_sharded = tagulous_tests_migration.models.set_model_sharded()
+        make_migration("initial")
+
+        try:
+            output = migrate_app()
+            self.assertEqual(
+                output,
+                [
+                    "Operations to perform:",
+                    "  Apply all migrations: tagulous_tests_migration",
+                    "Running migrations:",
+                ]
+                + ["  Applying tagulous_tests_migration.0001_initial... OK"],
+            )
+
+            # The shard model should be usable
+            model_sharded.objects.create(name="Test 1", tags="one, two")
+            model_sharded.objects.create(name="Test 2", tags="one")
+            model_sharded.tags.tag_model.objects.fold_count_shards()
+            self.assertTagModel(model_sharded.tags.tag_model, {"one": 2, "two": 1})
+        finally:
+            # Roll back so the tables don't remain for other tests
+            migrate_app(target="zero")
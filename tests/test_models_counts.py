@@ -0,0 +1,316 @@
+"""
+Tagulous test: Deferred tag counts and count shards
+
+Modules tested:
+    tagulous.models.counts
+    tagulous.models.models.TagModelQuerySet
+"""
+from django.db import connection, connections, transaction
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+
+from tagulous import settings as tagulous_settings
+from tagulous.models import counts
+from tagulous.models.counts import gc_tag_model, recount_tag_model
+from tests.lib import TagTestManager
+from tests.tagulous_tests_app import models as test_models
+
+
+class DeferCountsTest(TagTestManager, TransactionTestCase):
+    """
+    Test tag counts are deferred until the transaction commits
+    """
+
+    manage_models = [test_models.MixedTest]
+
+    def setUpExtra(self):
+        self.defer_counts = tagulous_settings.DEFER_COUNTS
+        tagulous_settings.DEFER_COUNTS = True
+        self.model = test_models.MixedTest
+        self.tag_model = test_models.MixedTestTagModel
+
+    def tearDownExtra(self):
+        tagulous_settings.DEFER_COUNTS = self.defer_counts
+
+    def test_deferred_until_commit(self):
+        with transaction.atomic():
+            for i in range(3):
+                self.model.objects.create(name="Test %d" % i, singletag="red")
+            self.assertTagModel(self.tag_model, {"red": 0})
+        self.assertTagModel(self.tag_model, {"red": 3})
+
+    def count_updates(self, queries):
+        return len(
+            [
+                query
+                for query in queries.captured_queries
+                if query["sql"].startswith("UPDATE")
+                and self.tag_model._meta.db_table in query["sql"]
+            ]
+        )
+
+    def test_coalesced(self):
+        objs = [self.model.objects.create(name="Test %d" % i) for i in range(5)]
+        with CaptureQueriesContext(connection) as queries:
+            with transaction.atomic():
+                for obj in objs:
+                    obj.singletag = "red"
+                    obj.tags = "blue, green"
+                    obj.save()
+        self.assertTagModel(self.tag_model, {"red": 5, "blue": 5, "green": 5})
+        self.assertEqual(self.count_updates(queries), 1)
+
+    def test_coalesced_savepoints(self):
+        def create(count):
+            with CaptureQueriesContext(connection) as queries:
+                with transaction.atomic():
+                    for i in range(count):
+                        # Creates a savepoint for each object
+                        self.model.objects.create(
+                            name="Test %d" % i, singletag="red", tags="blue"
+                        )
+            return self.count_updates(queries)
+
+        self.assertEqual(create(2), create(10))
+        self.assertTagModel(self.tag_model, {"red": 12, "blue": 12})
+
+    def test_instance_count_updated(self):
+        red = self.tag_model.objects.create(name="red")
+        with transaction.atomic():
+            self.tag_model.objects.change_counts({red: 2})
+            self.assertEqual(red.count, 2)
+            self.assertTagModel(self.tag_model, {"red": 0})
+        self.assertTagModel(self.tag_model, {"red": 2})
+
+    def test_rollback_discards(self):
+        self.model.objects.create(name="Test 1", singletag="red")
+        self.assertTagModel(self.tag_model, {"red": 1})
+
+        try:
+            with transaction.atomic():
+                self.model.objects.create(name="Test 2", singletag="red")
+                raise ValueError("Rollback")
+        except ValueError:
+            pass
+        self.assertTagModel(self.tag_model, {"red": 1})
+
+        # Buffer should not leak into the next transaction
+        with transaction.atomic():
+            self.model.objects.create(name="Test 3", singletag="red")
+        self.assertTagModel(self.tag_model, {"red": 2})
+
+    def test_savepoint_rollback_discards(self):
+        with transaction.atomic():
+            self.model.objects.create(name="Test 1", singletag="red")
+            try:
+                with transaction.atomic():
+                    self.model.objects.create(name="Test 2", singletag="red")
+                    raise ValueError("Rollback")
+            except ValueError:
+                pass
+            self.model.objects.create(name="Test 3", singletag="red")
+        self.assertTagModel(self.tag_model, {"red": 2})
+
+    def test_savepoint_rollback_coalesced(self):
+        "Released savepoints are still merged when another is rolled back"
+
+        def create(count):
+            with CaptureQueriesContext(connection) as queries:
+                with transaction.atomic():
+                    try:
+                        with transaction.atomic():
+                            self.model.objects.create(name="Rollback", singletag="red")
+                            raise ValueError("Rollback")
+                    except ValueError:
+                        pass
+                    for i in range(count):
+                        self.model.objects.create(name="Test %d" % i, singletag="red")
+            return self.count_updates(queries)
+
+        self.assertEqual(create(2), create(10))
+        self.assertTagModel(self.tag_model, {"red": 12})
+
+    def test_savepoint_rollback_buffer_alive(self):
+        "A buffer discarded by a rollback is not reused while still referenced"
+        default = connections["default"]
+        with transaction.atomic():
+            self.model.objects.create(name="Test 1", singletag="red")
+            try:
+                with transaction.atomic():
+                    self.model.objects.create(name="Test 2", singletag="red")
+                    # Keep the buffers alive after Django discards them
+                    kept = list(counts._buffers[default])
+                    raise ValueError("Rollback")
+            except ValueError:
+                pass
+            self.model.objects.create(name="Test 3", singletag="red")
+        self.assertTagModel(self.tag_model, {"red": 2})
+        self.assertEqual(len(kept), 2)
+
+    def test_registry_cleared(self):
+        "Buffers are removed from the registry on commit and rollback"
+        default = connections["default"]
+        with transaction.atomic():
+            self.model.objects.create(name="Test 1", singletag="red")
+            self.assertEqual(len(counts._buffers[default]), 1)
+        self.assertEqual(len(counts._buffers[default]), 0)
+
+        try:
+            with transaction.atomic():
+                self.model.objects.create(name="Test 2", singletag="red")
+                raise ValueError("Rollback")
+        except ValueError:
+            pass
+        self.assertEqual(len(counts._buffers[default]), 0)
+
+    def test_unused_deleted_on_commit(self):
+        t1 = self.model.objects.create(name="Test 1", tags="blue, green, red")
+        green = self.tag_model.objects.get(name="green")
+        green.protected = True
+        green.save()
+
+        with transaction.atomic():
+            t1.tags = "red"
+            t1.save()
+            self.assertTagModel(self.tag_model, {"blue": 1, "green": 1, "red": 1})
+        self.assertTagModel(self.tag_model, {"green": 0, "red": 1})
+
+    def test_autocommit_immediate(self):
+        self.model.objects.create(name="Test 1", singletag="red")
+        self.assertTagModel(self.tag_model, {"red": 1})
+
+
+class CountShardsTest(TagTestManager, TestCase):
+    """
+    Test tag counts held in count shards
+    """
+
+    manage_models = [test_models.ShardedTest]
+
+    def setUpExtra(self):
+        self.model = test_models.ShardedTest
+        self.tag_model = test_models.ShardedTagModel
+        self.shard_model = self.tag_model.count_shard_model
+
+    def assertCounts(self, tag_model, tag_counts):
+        "Check the counts include the shards"
+        counts = tag_model.objects.get_counts()
+        self.assertEqual(
+            {tag.name: counts[tag.pk] for tag in tag_model.objects.all()}, tag_counts
+        )
+
+    def test_shard_model(self):
+        "Check count shard models are created for tag models with count_shards"
+        self.assertEqual(
+            self.shard_model.__name__, "Tagulous_ShardedTagModel_count_shards"
+        )
+        self.assertEqual(
+            self.model.tree.tag_model.count_shard_model.__name__,
+            "Tagulous_ShardedTest_tree_count_shards",
+        )
+        self.assertIsNone(test_models.MixedTestTagModel.count_shard_model)
+
+    def test_shard_not_related(self):
+        "Check the count shard model is not treated as a related field"
+        self.assertSequenceEqual(
+            [
+                related.related_model
+                for related in self.tag_model.get_related_fields(
+                    include_standard=True
+                )
+            ],
+            [self.model, self.model],
+        )
+
+    def test_changes_to_shards(self):
+        "Check count changes are made to the shards, not the tags"
+        for i in range(10):
+            self.model.objects.create(name="Test %d" % i, singletag="red", tags="red")
+        self.assertTagModel(self.tag_model, {"red": 0})
+        self.assertCounts(self.tag_model, {"red": 20})
+
+        red = self.tag_model.objects.get(name="red")
+        shards = self.shard_model.objects.filter(tag=red)
+        self.assertLessEqual(shards.count(), 4)
+        self.assertTrue(all(0 <= shard.shard < 4 for shard in shards))
+
+    def test_instance_count(self):
+        "Check the instance count includes the shards"
+        red = self.tag_model.objects.create(name="red")
+        red.increment()
+        red.increment()
+        self.assertEqual(red.count, 2)
+        red.decrement()
+        self.assertEqual(red.count, 1)
+
+    def test_delete_unused_inline(self):
+        "Check tags are deleted when the count including shards reaches 0"
+        t1 = self.model.objects.create(name="Test 1", tags="blue, red")
+        self.tag_model.objects.fold_count_shards()
+        self.assertTagModel(self.tag_model, {"blue": 1, "red": 1})
+
+        t1.tags = "red"
+        t1.save()
+        self.assertTagModel(self.tag_model, {"red": 1})
+        self.assertFalse(self.shard_model.objects.exclude(tag__name="red").exists())
+
+    def test_delete_unused_bulk(self):
+        "Check delete_unused uses the count including shards"
+        red = self.tag_model.objects.create(name="red", count=1)
+        blue = self.tag_model.objects.create(name="blue")
+        self.tag_model.objects.filter(pk__in=[red.pk, blue.pk])._update_counts(
+            {red.pk: -1, blue.pk: 1}
+        )
+        self.assertEqual(self.tag_model.objects.delete_unused(), 1)
+        self.assertCounts(self.tag_model, {"blue": 1})
+
+    def test_fold(self):
+        "Check shards are folded into the tag counts"
+        for i in range(5):
+            self.model.objects.create(name="Test %d" % i, tags="blue, red")
+        self.assertTagModel(self.tag_model, {"blue": 0, "red": 0})
+
+        self.assertEqual(self.tag_model.objects.fold_count_shards(), 2)
+        self.assertTagModel(self.tag_model, {"blue": 5, "red": 5})
+        self.assertCounts(self.tag_model, {"blue": 5, "red": 5})
+        self.assertFalse(self.shard_model.objects.exclude(count=0).exists())
+
+        # Nothing left to fold
+        self.assertEqual(self.tag_model.objects.fold_count_shards(), 0)
+
+    def test_fold_unsharded(self):
+        "Check fold does nothing for tag models without count shards"
+        tag_model = test_models.MixedTestTagModel
+        self.assertEqual(tag_model.objects.fold_count_shards(), 0)
+
+    def test_recount_folds(self):
+        "Check recount folds the shards"
+        self.model.objects.create(name="Test 1", singletag="red", tags="blue, red")
+        self.tag_model.objects.filter(name="blue").update(count=5)
+        # Only blue is wrong once red has been folded
+        self.assertEqual(recount_tag_model(self.tag_model), 1)
+        self.assertTagModel(self.tag_model, {"blue": 1, "red": 2})
+        self.assertCounts(self.tag_model, {"blue": 1, "red": 2})
+
+    def test_recount_dry_run(self):
+        "Check a recount dry run includes the shards without folding them"
+        self.model.objects.create(name="Test 1", singletag="red", tags="blue, red")
+        self.tag_model.objects.filter(name="blue").update(count=5)
+        self.assertEqual(recount_tag_model(self.tag_model, dry_run=True), 1)
+        self.assertTagModel(self.tag_model, {"blue": 5, "red": 0})
+
+    def test_gc(self):
+        "Check gc folds the shards and deletes unused tags"
+        self.model.objects.create(name="Test 1", tags="blue")
+        self.tag_model.objects.create(name="red")
+        self.assertEqual(gc_tag_model(self.tag_model), 1)
+        self.assertTagModel(self.tag_model, {"blue": 1})
+
+    def test_tree(self):
+        "Check tree tag counts use shards, and unused parents are deleted"
+        tag_model = self.model.tree.tag_model
+        t1 = self.model.objects.create(name="Test 1", tree="animal/cat")
+        self.assertCounts(tag_model, {"animal": 0, "animal/cat": 1})
+        t1.tree = ""
+        t1.save()
+        self.assertTagModel(tag_model, {})
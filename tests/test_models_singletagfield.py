@@ -254,6 +254,33 @@ class ModelSingleTagFieldTest(TagTestManager, TestCase):
         t1.save()
         self.assertTagModel(self.tag_model, {"Mr": 1})
 
+    def test_select_related(self):
+        "Check tags loaded by select_related are used without more queries"
+        for i in range(3):
+            self.test_model.objects.create(name="Test %d" % i, title="Mr")
+        with self.assertNumQueries(1):
+            objs = list(self.test_model.objects.select_related("title"))
+            self.assertEqual([str(obj.title) for obj in objs], ["Mr", "Mr", "Mr"])
+            self.assertEqual([obj.title.count for obj in objs], [3, 3, 3])
+
+    def test_prefetch_related(self):
+        "Check tags loaded by prefetch_related are used without more queries"
+        for i in range(3):
+            self.test_model.objects.create(name="Test %d" % i, title="Mr")
+        with self.assertNumQueries(2):
+            objs = list(self.test_model.objects.prefetch_related("title"))
+            self.assertEqual([str(obj.title) for obj in objs], ["Mr", "Mr", "Mr"])
+
+    def test_select_related_changed(self):
+        "Check a tag loaded by select_related is not used once it is changed"
+        self.test_model.objects.create(name="Test 1", title="Mr")
+        t1 = self.test_model.objects.select_related("title").get()
+        self.assertEqual(t1.title, "Mr")
+        t1.title = "Mrs"
+        t1.save()
+        self.assertEqual(t1.title, "Mrs")
+        self.assertTagModel(self.tag_model, {"Mrs": 1})
+
     def test_multiple_unsaved(self):
         "Check that there's no leak between unsaved objects"
         t1 = self.test_model(name="Test 1", title="Mr")
@@ -492,6 +519,20 @@ class ModelSingleTagFieldRequiredTest(TagTestManager, TestCase):
             test_models.SingleTagFieldRequiredModel.objects.create(name="Test")
         self.assertEqual(cm.exception.messages[0], "This field cannot be null.")
 
+    def test_required_update_raises(self):
+        "Check a required SingleTagField raises an exception in update"
+        with self.assertRaises(exceptions.ValidationError) as cm:
+            test_models.SingleTagFieldRequiredModel.objects.update(tag=None)
+        self.assertEqual(cm.exception.messages[0], "This field cannot be null.")
+
+    def test_required_bulk_create_raises(self):
+        "Check a required SingleTagField raises an exception in bulk_create"
+        with self.assertRaises(exceptions.ValidationError) as cm:
+            test_models.SingleTagFieldRequiredModel.objects.bulk_create(
+                [test_models.SingleTagFieldRequiredModel(name="Test")]
+            )
+        self.assertEqual(cm.exception.messages[0], "This field cannot be null.")
+
 
 # ##############################################################################
 # ###### Test multiple SingleTagFields on a model
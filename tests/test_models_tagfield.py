@@ -8,8 +8,9 @@ Modules tested:
     tagulous.models.fields.BaseTagField
     tagulous.models.fields.TagField
 """
-from django.db import models
+from django.db import connection, models
 from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
 
 from tagulous import models as tag_models
 from tests.lib import TagTestManager, skip_if_mysql
@@ -60,6 +61,24 @@ class ModelTagFieldTest(TagTestManager, TestCase):
         self.assertEqual(t1.tags.get_tag_string(), "blue, red")
         self.assertTagModel(self.tag_model, {})
 
+    def test_tag_assign_before_save_single_query(self):
+        """
+        Check existing tags are found in a single query when a tag string is
+        assigned, and are matched case insensitively
+        """
+        self.tag_model.objects.create(name="Blue")
+        self.tag_model.objects.create(name="red")
+        t1 = self.test_model(name="Test")
+        names = ["tag%02d" % i for i in range(30)]
+        with self.assertNumQueries(1):
+            t1.tags = ", ".join(names + ["blue", "Red"])
+
+        tags = {tag.name: tag for tag in t1.tags.tags}
+        self.assertEqual(len(tags), 32)
+        self.assertIsNotNone(tags["Blue"].pk)
+        self.assertIsNotNone(tags["red"].pk)
+        self.assertIsNone(tags["tag00"].pk)
+
     def test_tag_assign_in_constructor(self):
         "Check a tag string can be set in the constructor"
         t1 = self.test_model(name="Test", tags="blue, red")
@@ -389,6 +408,25 @@ class ModelTagFieldTest(TagTestManager, TestCase):
         self.assertInstanceEqual(t1, name="Test 1", tags="blue, green")
         self.assertTagModel(self.tag_model, {"blue": 1, "green": 1})
 
+    def test_change_string_save_queries_constant(self):
+        "Check changing tags takes the same number of queries however many change"
+
+        def change_tags(count):
+            # Tags are in use elsewhere, so will not be deleted
+            old = ["old%d.%02d" % (count, i) for i in range(count)]
+            new = ["new%d.%02d" % (count, i) for i in range(count)]
+            self.create(self.test_model, name="Other", tags=old + new)
+            t1 = self.create(self.test_model, name="Test", tags=old)
+            t1.tags = new
+            with CaptureQueriesContext(connection) as queries:
+                t1.tags.save()
+            self.assertInstanceEqual(t1, name="Test", tags=", ".join(new))
+            self.assertEqual(self.tag_model.objects.get(name=old[0]).count, 1)
+            self.assertEqual(self.tag_model.objects.get(name=new[0]).count, 2)
+            return len(queries)
+
+        self.assertEqual(change_tags(2), change_tags(20))
+
     def test_m2m_set_by_string(self):
         "Set a tag directly using M2M .set([string])"
         t1 = self.create(self.test_model, name="Test 1", tags="blue, red")
@@ -559,6 +597,15 @@ class ModelTagFieldTest(TagTestManager, TestCase):
             t1.tags.clear()
         self.assertEqual(str(cm.exception), errmsg)
 
+    def test_manager_class_cached(self):
+        "Check the TagRelatedManager class is shared between instances"
+        t1 = self.create(self.test_model, name="Test 1", tags="blue")
+        t2 = self.create(self.test_model, name="Test 2", tags="red")
+        manager_cls = type(t1.tags)
+        self.assertIsInstance(t1.tags, tag_models.TagRelatedManagerMixin)
+        self.assertIs(type(t2.tags), manager_cls)
+        self.assertIs(type(self.test_model.objects.get(pk=t1.pk).tags), manager_cls)
+
     def test_prefetch_related(self):
         self.create(self.test_model, name="Test 1", tags="blue, green")
         self.create(self.test_model, name="Test 2", tags="blue, red")
@@ -10,11 +10,13 @@ import inspect
 import pickle
 
 from django.core.exceptions import MultipleObjectsReturned
-from django.db import models
+from django.db import connection, models
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 
 from tagulous import models as tag_models
 from tagulous.models.tagged import _split_kwargs
+from tagulous.signals.post import PostSaveHandler
 from tests.lib import TagTestManager, skip_if_mysql
 from tests.tagulous_tests_app import models as test_models
 
@@ -53,6 +55,18 @@ class ModelTaggedTest(TagTestManager, TestCase):
         "Check normal base manager hasn't been modified"
         self.assertFalse(issubclass(models.Manager, tag_models.TaggedManager))
 
+    def test_tag_fields_prepared(self):
+        "Check tag fields are found for signal handlers when the model is prepared"
+        handler = PostSaveHandler()
+        self.assertEqual(
+            [
+                (field.name, field_type)
+                for field, field_type in handler.get_fields(self.test_model)
+            ],
+            [("singletag", tag_models.SingleTagField), ("tags", tag_models.TagField)],
+        )
+        self.assertEqual(list(handler.get_fields(test_models.MixedTestTagModel)), [])
+
     def test_init(self):
         "Check constructor can set singletag and tag fields"
         t1 = self.test_model(name="Test 1", singletag="Mr", tags="red, blue")
@@ -61,6 +75,82 @@ class ModelTaggedTest(TagTestManager, TestCase):
         self.assertEqual(str(t2.singletag), "Mr")
         self.assertEqual(str(t2.tags), "blue, red")
 
+    def test_save_untouched(self):
+        "Check saving without reading or writing tag fields has no tag queries"
+        self.test_model.objects.create(name="Test 1", singletag="Mr", tags="red")
+        t1 = self.test_model.objects.get(name="Test 1")
+        t1.name = "Test 2"
+        with self.assertNumQueries(1):
+            t1.save()
+
+        t2 = self.test_model.objects.get(name="Test 2")
+        self.assertEqual(str(t2.singletag), "Mr")
+        self.assertEqual(str(t2.tags), "red")
+        self.assertTagModel(test_models.MixedTestTagModel, {"Mr": 1, "red": 1})
+
+    def test_save_touched(self):
+        "Check saving after changing one tag field only handles that field"
+        self.test_model.objects.create(name="Test 1", singletag="Mr", tags="red")
+        t1 = self.test_model.objects.get(name="Test 1")
+        t1.tags = "blue"
+        t1.save()
+        self.assertFalse(
+            hasattr(t1, t1._meta.get_field("singletag").get_manager_name())
+        )
+        self.assertTagModel(test_models.MixedTestTagModel, {"Mr": 1, "blue": 1})
+
+    def test_save_update_fields(self):
+        "Check SingleTagFields not in update_fields are not saved"
+        t1 = self.test_model.objects.create(name="Test 1", singletag="Mr", tags="red")
+        t1.name = "Test 2"
+        t1.singletag = "Mrs"
+        t1.tags = "blue"
+        t1.save(update_fields=["name"])
+
+        t2 = self.test_model.objects.get(name="Test 2")
+        self.assertEqual(str(t2.singletag), "Mr")
+        self.assertEqual(str(t2.tags), "blue")
+        self.assertTagModel(test_models.MixedTestTagModel, {"Mr": 1, "blue": 1})
+
+    def test_save_deferred(self):
+        "Check tag fields are saved on an instance loaded with defer()"
+        self.test_model.objects.create(name="Test 1", singletag="Mr", tags="red")
+        t1 = self.test_model.objects.defer("name").get()
+        t1.singletag = "Mrs"
+        t1.tags = "blue, green"
+        t1.save()
+
+        t2 = self.test_model.objects.get(name="Test 1")
+        self.assertEqual(str(t2.singletag), "Mrs")
+        self.assertEqual(str(t2.tags), "blue, green")
+        self.assertTagModel(
+            test_models.MixedTestTagModel, {"Mrs": 1, "blue": 1, "green": 1}
+        )
+
+    def test_save_only(self):
+        "Check a TagField is saved on an instance loaded with only()"
+        self.test_model.objects.create(name="Test 1", singletag="Mr", tags="red")
+        t1 = self.test_model.objects.only("name").get()
+        t1.tags = "blue"
+        t1.save()
+
+        t2 = self.test_model.objects.get(name="Test 1")
+        self.assertEqual(str(t2.singletag), "Mr")
+        self.assertEqual(str(t2.tags), "blue")
+        self.assertTagModel(test_models.MixedTestTagModel, {"Mr": 1, "blue": 1})
+
+    def test_save_update_fields_singletag(self):
+        "Check a SingleTagField in update_fields is saved"
+        t1 = self.test_model.objects.create(name="Test 1", singletag="Mr", tags="red")
+        t1.singletag = "Mrs"
+        t1.tags = "blue"
+        t1.save(update_fields=["singletag"])
+
+        t2 = self.test_model.objects.get(name="Test 1")
+        self.assertEqual(str(t2.singletag), "Mrs")
+        self.assertEqual(str(t2.tags), "blue")
+        self.assertTagModel(test_models.MixedTestTagModel, {"Mrs": 1, "blue": 1})
+
     def test_pickle(self):
         "Check tagged models can be pickled"
         t1 = self.test_model(name="Test 1", singletag="Mr", tags="red, blue")
@@ -469,6 +559,71 @@ class ModelTaggedQuerysetTest(TagTestManager, TestCase):
         self.assertEqual(qs1[1].pk, self.o2.pk)
         self.assertEqual(qs1[2].pk, self.o3.pk)
 
+    #
+    # .prefetch_tags()
+    #
+
+    def test_prefetch_tags(self):
+        "Check prefetch_tags loads all tag fields with one query per field"
+        with self.assertNumQueries(3):
+            objs = list(self.test_model.objects.prefetch_tags())
+            self.assertEqual(
+                [(str(obj.singletag), str(obj.tags)) for obj in objs],
+                [
+                    ("Mr", "blue, green, red"),
+                    ("Mrs", "blue, green, red"),
+                    ("Mr", "green, red"),
+                ],
+            )
+            self.assertTrue(all("red" in obj.tags for obj in objs))
+            self.assertEqual(objs[2].tags.get_tag_list(), ["green", "red"])
+
+    def test_prefetch_tags_field(self):
+        "Check prefetch_tags only loads the named fields"
+        with self.assertNumQueries(2):
+            objs = list(
+                self.test_model.objects.filter(name="Test 3").prefetch_tags("tags")
+            )
+            self.assertEqual(str(objs[0].tags), "green, red")
+        # Not prefetched, so looked up as normal
+        self.assertFalse(self.test_model.singletag.is_cached(objs[0]))
+        self.assertEqual(str(objs[0].singletag), "Mr")
+
+    def test_prefetch_tags_chained(self):
+        "Check prefetch_tags is kept when the queryset is chained"
+        with self.assertNumQueries(2):
+            obj = self.test_model.objects.prefetch_tags("tags").get(name="Test 1")
+            self.assertEqual(str(obj.tags), "blue, green, red")
+
+    def test_prefetch_tags_empty(self):
+        "Check prefetch_tags caches empty tag fields"
+        self.test_model.objects.create(name="Test 4")
+        # No SingleTagField values to look up
+        with self.assertNumQueries(2):
+            obj = self.test_model.objects.prefetch_tags().get(name="Test 4")
+            self.assertIsNone(obj.singletag)
+            self.assertEqual(str(obj.tags), "")
+
+    def test_prefetch_tags_save(self):
+        "Check instances with prefetched tags can be changed and saved"
+        obj = self.test_model.objects.prefetch_tags().get(name="Test 3")
+        obj.singletag = "Mrs"
+        obj.tags = "red"
+        obj.save()
+        self.assertInstanceEqual(obj, singletag="Mrs", tags="red")
+        self.assertTagModel(
+            self.test_model.tags.tag_model,
+            {"Mr": 1, "Mrs": 2, "red": 3, "green": 2, "blue": 2},
+        )
+
+    def test_prefetch_tags_invalid(self):
+        "Check prefetch_tags raises an exception for fields which are not tags"
+        with self.assertRaises(ValueError) as cm:
+            self.test_model.objects.prefetch_tags("name")
+        self.assertEqual(
+            str(cm.exception), "Cannot prefetch tags for name: it is not a tag field"
+        )
+
     #
     # pickle
     #
@@ -492,6 +647,455 @@ class ModelTaggedQuerysetTest(TagTestManager, TestCase):
         self.assertEqual(str(unpickled_qs[2].tags), "green, red")
 
 
+class ModelTaggedQuerysetBulkTagsTest(TagTestManager, TestCase):
+    """
+    Test add_tags, remove_tags and set_tags on tagged model querysets
+    """
+
+    manage_models = [test_models.MixedTest]
+
+    def setUpExtra(self):
+        self.test_model = test_models.MixedTest
+        self.tag_model = test_models.MixedTestTagModel
+
+        self.o1 = self.test_model.objects.create(
+            name="Test 1", singletag="Mr", tags="red, green, blue"
+        )
+        self.o2 = self.test_model.objects.create(
+            name="Test 2", singletag="Mrs", tags="red, green, blue"
+        )
+        self.o3 = self.test_model.objects.create(
+            name="Test 3", singletag="Mr", tags="red, green"
+        )
+
+    def assertTags(self, *tag_strings):
+        for obj, tag_string in zip((self.o1, self.o2, self.o3), tag_strings):
+            obj.refresh_from_db()
+            obj.tags.reload()
+            self.assertEqual(str(obj.tags), tag_string)
+
+    def test_add_tags(self):
+        "Check add_tags adds tags to objects which do not have them"
+        self.test_model.objects.exclude(name="Test 1").add_tags("tags", "blue, yellow")
+        self.assertTags(
+            "blue, green, red", "blue, green, red, yellow", "blue, green, red, yellow"
+        )
+        self.assertTagModel(
+            self.tag_model,
+            {"Mr": 2, "Mrs": 1, "red": 3, "green": 3, "blue": 3, "yellow": 2},
+        )
+
+    def test_add_tags_queries(self):
+        "Check add_tags does not use more queries for more objects"
+
+        def add_tags(tag_string):
+            with CaptureQueriesContext(connection) as queries:
+                self.test_model.objects.all().add_tags("tags", tag_string)
+            return len(queries.captured_queries)
+
+        small = add_tags("yellow")
+        for i in range(10):
+            self.test_model.objects.create(name="Test %d" % (i + 4))
+        self.assertEqual(add_tags("purple"), small)
+        self.assertTagModel(
+            self.tag_model,
+            {
+                "Mr": 2,
+                "Mrs": 1,
+                "red": 3,
+                "green": 3,
+                "blue": 2,
+                "yellow": 3,
+                "purple": 13,
+            },
+        )
+
+    def test_add_tags_duplicate_rows(self):
+        "Check add_tags only counts each object once"
+        qs = self.test_model.objects.filter(tags__name__in=["red", "green"])
+        self.assertEqual(qs.count(), 6)
+        qs.add_tags("tags", ["yellow"])
+        self.assertTagModel(
+            self.tag_model,
+            {"Mr": 2, "Mrs": 1, "red": 3, "green": 3, "blue": 2, "yellow": 3},
+        )
+
+    def test_add_tags_many(self):
+        "Check add_tags can add more tags than a compound select can hold"
+        names = ["tag %03d" % i for i in range(600)]
+        self.test_model.objects.exclude(name="Test 1").add_tags("tags", names)
+        self.o2.tags.reload()
+        self.assertEqual(self.o2.tags.count(), 603)
+        self.assertEqual(
+            self.tag_model.objects.filter(name__in=names, count=2).count(), 600
+        )
+
+        # Adding them again should not add duplicate rows
+        self.test_model.objects.all().add_tags("tags", names)
+        self.o2.tags.reload()
+        self.assertEqual(self.o2.tags.count(), 603)
+        self.assertEqual(
+            self.tag_model.objects.filter(name__in=names, count=3).count(), 600
+        )
+
+    def test_add_tags_manager(self):
+        "Check add_tags can be called on the manager"
+        self.test_model.objects.add_tags(
+            "tags", [self.tag_model.objects.get(name="Mr")]
+        )
+        self.assertTags(
+            "Mr, blue, green, red", "Mr, blue, green, red", "Mr, green, red"
+        )
+        self.assertTagModel(
+            self.tag_model,
+            {"Mr": 5, "Mrs": 1, "red": 3, "green": 3, "blue": 2},
+        )
+
+    def test_remove_tags(self):
+        "Check remove_tags removes tags and deletes unused tags"
+        self.test_model.objects.filter(name__in=["Test 1", "Test 3"]).remove_tags(
+            "tags", "green, purple"
+        )
+        self.assertTags("blue, red", "blue, green, red", "red")
+        self.assertTagModel(
+            self.tag_model, {"Mr": 2, "Mrs": 1, "red": 3, "green": 1, "blue": 2}
+        )
+
+        self.test_model.objects.remove_tags("tags", "green")
+        self.assertTags("blue, red", "blue, red", "red")
+        self.assertTagModel(self.tag_model, {"Mr": 2, "Mrs": 1, "red": 3, "blue": 2})
+
+    def test_set_tags(self):
+        "Check set_tags replaces the tags"
+        self.test_model.objects.exclude(name="Test 2").set_tags("tags", "red, yellow")
+        self.assertTags("red, yellow", "blue, green, red", "red, yellow")
+        self.assertTagModel(
+            self.tag_model,
+            {"Mr": 2, "Mrs": 1, "red": 3, "green": 1, "blue": 1, "yellow": 2},
+        )
+
+        self.test_model.objects.set_tags("tags", "")
+        self.assertTags("", "", "")
+        self.assertTagModel(self.tag_model, {"Mr": 2, "Mrs": 1})
+
+    def test_not_tagfield(self):
+        "Check bulk tag methods only work on TagFields"
+        with self.assertRaises(ValueError) as cm:
+            self.test_model.objects.add_tags("singletag", "Mr")
+        self.assertEqual(
+            str(cm.exception), "Cannot add tags to singletag: it is not a TagField"
+        )
+
+    def test_sliced(self):
+        "Check bulk tag methods cannot be used on a sliced queryset"
+        with self.assertRaises(TypeError) as cm:
+            self.test_model.objects.all()[:1].add_tags("tags", "yellow")
+        self.assertEqual(
+            str(cm.exception), "Cannot change tags once a slice has been taken."
+        )
+
+
+class ModelTaggedQuerysetUpdateTest(TagTestManager, TestCase):
+    """
+    Test update on tagged model querysets
+    """
+
+    manage_models = [test_models.MixedTest]
+
+    def setUpExtra(self):
+        self.test_model = test_models.MixedTest
+        self.tag_model = test_models.MixedTestTagModel
+
+        self.o1 = self.test_model.objects.create(name="Test 1", singletag="Mr")
+        self.o2 = self.test_model.objects.create(name="Test 2", singletag="Mrs")
+        self.o3 = self.test_model.objects.create(name="Test 3", singletag="Mr")
+        self.o4 = self.test_model.objects.create(name="Test 4")
+
+    def assertSingletags(self, *names):
+        self.assertEqual(
+            [
+                str(obj.singletag) if obj.singletag else None
+                for obj in self.test_model.objects.order_by("name")
+            ],
+            list(names),
+        )
+
+    def test_update_name(self):
+        "Check update sets a SingleTagField by name and changes the counts"
+        rows = self.test_model.objects.exclude(name="Test 3").update(singletag="Dr")
+        self.assertEqual(rows, 3)
+        self.assertSingletags("Dr", "Dr", "Mr", "Dr")
+        self.assertTagModel(self.tag_model, {"Mr": 1, "Dr": 3})
+
+    def test_update_existing(self):
+        "Check update counts objects which already have the tag"
+        self.test_model.objects.update(singletag="mr")
+        self.assertSingletags("Mr", "Mr", "Mr", "Mr")
+        self.assertTagModel(self.tag_model, {"Mr": 4})
+
+    def test_update_tag(self):
+        "Check update sets a SingleTagField to a tag"
+        mrs = self.tag_model.objects.get(name="Mrs")
+        self.test_model.objects.filter(name="Test 1").update(singletag=mrs)
+        self.assertSingletags("Mrs", "Mrs", "Mr", None)
+        self.assertTagModel(self.tag_model, {"Mr": 1, "Mrs": 2})
+
+    def test_update_none(self):
+        "Check update clears a SingleTagField"
+        self.test_model.objects.filter(name__in=["Test 1", "Test 2"]).update(
+            singletag=None, name="Cleared"
+        )
+        self.assertEqual(self.test_model.objects.filter(name="Cleared").count(), 2)
+        self.assertTagModel(self.tag_model, {"Mr": 1})
+
+    def test_update_queries(self):
+        "Check update does not use more queries for more objects"
+
+        def update(name):
+            with CaptureQueriesContext(connection) as queries:
+                self.test_model.objects.update(singletag=name)
+            return len(queries.captured_queries)
+
+        small = update("Dr")
+        for i in range(10):
+            self.test_model.objects.create(name="Test %d" % (i + 5), singletag="Mr")
+        self.assertEqual(update("Prof"), small)
+        self.assertTagModel(self.tag_model, {"Prof": 14})
+
+    def test_update_other_fields(self):
+        "Check update without SingleTagFields works as normal"
+        self.assertEqual(self.test_model.objects.update(name="Test"), 4)
+        self.assertTagModel(self.tag_model, {"Mr": 2, "Mrs": 1})
+
+    def test_update_sliced(self):
+        "Check update cannot be used on a sliced queryset"
+        with self.assertRaises(TypeError) as cm:
+            self.test_model.objects.all()[:1].update(singletag="Dr")
+        self.assertEqual(
+            str(cm.exception), "Cannot update a query once a slice has been taken."
+        )
+
+
+class ModelTaggedQuerysetDeleteTest(TagTestManager, TestCase):
+    """
+    Test delete on tagged model querysets
+    """
+
+    manage_models = [
+        test_models.MixedTest,
+        test_models.SingleTagFieldConcreteInheritanceModel,
+        test_models.TagFieldConcreteInheritanceModel,
+    ]
+
+    def setUpExtra(self):
+        self.test_model = test_models.MixedTest
+        self.tag_model = test_models.MixedTestTagModel
+
+        self.o1 = self.test_model.objects.create(
+            name="Test 1", singletag="Mr", tags="red, green, blue"
+        )
+        self.o2 = self.test_model.objects.create(
+            name="Test 2", singletag="Mrs", tags="red, green"
+        )
+        self.o3 = self.test_model.objects.create(
+            name="Test 3", singletag="Mr", tags="red"
+        )
+
+    def test_delete(self):
+        "Check delete changes tag counts and deletes unused tags"
+        deleted, __ = self.test_model.objects.exclude(name="Test 3").delete()
+        self.assertEqual(deleted, 7)
+        self.assertEqual(self.test_model.objects.count(), 1)
+        self.assertTagModel(self.tag_model, {"Mr": 1, "red": 1})
+
+        self.test_model.objects.all().delete()
+        self.assertTagModel(self.tag_model, {})
+
+    def test_delete_queries(self):
+        "Check delete does not use more queries for more objects"
+
+        def delete():
+            with CaptureQueriesContext(connection) as queries:
+                self.test_model.objects.all().delete()
+            return len(queries.captured_queries)
+
+        small = delete()
+        for i in range(10):
+            self.test_model.objects.create(
+                name="Test %d" % i, singletag="Mr %d" % (i % 2), tags="red, tag %d" % i
+            )
+        self.assertEqual(delete(), small)
+        self.assertTagModel(self.tag_model, {})
+
+    def test_delete_empty(self):
+        "Check delete works when nothing matches"
+        self.assertEqual(
+            self.test_model.objects.filter(name="Missing").delete(), (0, {})
+        )
+        self.assertTagModel(
+            self.tag_model, {"Mr": 2, "Mrs": 1, "red": 3, "green": 2, "blue": 1}
+        )
+
+    def test_delete_instance(self):
+        "Check deleting an instance still changes tag counts"
+        self.o1.delete()
+        self.assertTagModel(self.tag_model, {"Mr": 1, "Mrs": 1, "red": 2, "green": 1})
+
+    def test_delete_concrete_inheritance(self):
+        "Check tag fields on parent models are handled when deleting children"
+        single_model = test_models.SingleTagFieldConcreteInheritanceModel
+        single_model.objects.create(name="Test 1", title="Mr")
+        single_model.objects.create(name="Test 2", title="Mr")
+        tag_model = test_models.TagFieldConcreteInheritanceModel
+        tag_model.objects.create(name="Test 1", tags="red, green")
+        tag_model.objects.create(name="Test 2", tags="red")
+
+        single_model.objects.filter(name="Test 1").delete()
+        self.assertTagModel(single_model.title.tag_model, {"Mr": 1})
+        tag_model.objects.filter(name="Test 1").delete()
+        self.assertTagModel(tag_model.tags.tag_model, {"red": 1})
+
+
+class ModelTaggedBulkCreateTest(TagTestManager, TestCase):
+    """
+    Test bulk_create on tagged model querysets
+    """
+
+    manage_models = [test_models.MixedTest]
+
+    def setUpExtra(self):
+        self.test_model = test_models.MixedTest
+        self.tag_model = test_models.MixedTestTagModel
+
+    def test_bulk_create(self):
+        "Check tag field values are saved by bulk_create"
+        objs = self.test_model.objects.bulk_create(
+            [
+                self.test_model(name="Test 1", singletag="Mr", tags="red, green"),
+                self.test_model(name="Test 2", singletag="Mrs", tags="red"),
+                self.test_model(name="Test 3"),
+            ]
+        )
+        self.assertTagModel(self.tag_model, {"Mr": 1, "Mrs": 1, "red": 2, "green": 1})
+        self.assertInstanceEqual(objs[0], singletag="Mr", tags="green, red")
+        self.assertInstanceEqual(objs[1], singletag="Mrs", tags="red")
+        self.assertInstanceEqual(objs[2], singletag=None, tags="")
+
+    def test_bulk_create_instances(self):
+        "Check instances from bulk_create hold their saved tags"
+        objs = self.test_model.objects.bulk_create(
+            [self.test_model(name="Test 1", singletag="Mr", tags="red, green")]
+        )
+        with self.assertNumQueries(0):
+            self.assertEqual(objs[0].singletag.name, "Mr")
+            self.assertEqual(objs[0].tags.get_tag_list(), ["green", "red"])
+            self.assertFalse(objs[0].tags.changed)
+
+        # Can be changed and saved
+        objs[0].tags = "red"
+        objs[0].save()
+        self.assertTagModel(self.tag_model, {"Mr": 1, "red": 1})
+
+    def test_bulk_create_existing_tags(self):
+        "Check bulk_create uses existing tags"
+        self.test_model.objects.create(name="Test 1", singletag="Mr", tags="red")
+        self.test_model.objects.bulk_create(
+            [
+                self.test_model(name="Test 2", singletag="Mr", tags="red, blue"),
+                self.test_model(name="Test 3", singletag="mr", tags="Red"),
+            ]
+        )
+        self.assertTagModel(self.tag_model, {"Mr": 3, "red": 3, "blue": 1})
+
+    def test_bulk_create_queries(self):
+        "Check bulk_create does not use more queries for more objects"
+
+        def bulk_create(count):
+            objs = [
+                self.test_model(
+                    name="Test %d" % i, singletag="Mr %d" % i, tags="red, tag %d" % i
+                )
+                for i in range(count)
+            ]
+            with CaptureQueriesContext(connection) as queries:
+                self.test_model.objects.bulk_create(objs)
+            self.test_model.objects.all().delete()
+            return len(queries.captured_queries)
+
+        self.assertEqual(bulk_create(2), bulk_create(20))
+
+    def test_bulk_create_ignore_conflicts(self):
+        "Check bulk_create won't save tags with ignore_conflicts"
+        with self.assertRaises(ValueError) as cm:
+            self.test_model.objects.bulk_create(
+                [self.test_model(name="Test 1", tags="red")], ignore_conflicts=True
+            )
+        self.assertEqual(
+            str(cm.exception),
+            "Cannot save tag fields with bulk_create when ignore_conflicts or "
+            "update_conflicts is set",
+        )
+        self.assertEqual(self.test_model.objects.count(), 0)
+        self.assertTagModel(self.tag_model, {})
+
+        # Objects without tag values can still be created
+        self.test_model.objects.bulk_create(
+            [self.test_model(name="Test 1")], ignore_conflicts=True
+        )
+        self.assertEqual(self.test_model.objects.count(), 1)
+
+    def test_bulk_create_update_conflicts(self):
+        "Check bulk_create won't save tags with update_conflicts"
+        with self.assertRaises(ValueError) as cm:
+            self.test_model.objects.bulk_create(
+                [self.test_model(name="Test 1", singletag="Mr")],
+                update_conflicts=True,
+                update_fields=["name"],
+                unique_fields=["id"],
+            )
+        self.assertEqual(
+            str(cm.exception),
+            "Cannot save tag fields with bulk_create when ignore_conflicts or "
+            "update_conflicts is set",
+        )
+        self.assertEqual(self.test_model.objects.count(), 0)
+        self.assertTagModel(self.tag_model, {})
+
+
+class ModelTaggedQuerysetBulkTagsOptionsTest(TagTestManager, TestCase):
+    """
+    Test tag options are applied by add_tags and set_tags
+    """
+
+    manage_models = [test_models.TagFieldOptionsModel]
+
+    def setUpExtra(self):
+        self.test_model = test_models.TagFieldOptionsModel
+        self.o1 = self.test_model.objects.create(name="Test 1", max_count="a, b")
+        self.o2 = self.test_model.objects.create(name="Test 2", max_count="a")
+
+    def test_add_tags_max_count(self):
+        "Check add_tags won't take objects over max_count"
+        self.test_model.objects.add_tags("max_count", "a, c")
+        with self.assertRaises(ValueError) as cm:
+            self.test_model.objects.add_tags("max_count", "d")
+        self.assertEqual(str(cm.exception), "Cannot set more than 3 tags on this field")
+        self.assertTagModel(self.test_model.max_count, {"a": 2, "b": 1, "c": 2})
+
+    def test_set_tags_max_count(self):
+        "Check set_tags won't set more than max_count tags"
+        with self.assertRaises(ValueError) as cm:
+            self.test_model.objects.set_tags("max_count", "a, b, c, d")
+        self.assertEqual(str(cm.exception), "Cannot set more than 3 tags on this field")
+        self.test_model.objects.set_tags("max_count", "b, c, d")
+        self.assertTagModel(self.test_model.max_count, {"b": 2, "c": 2, "d": 2})
+
+    def test_force_lowercase(self):
+        "Check tag names are normalised"
+        self.test_model.objects.add_tags("force_lowercase_true", "Adam, ADAM")
+        self.assertTagModel(self.test_model.force_lowercase_true, {"adam": 2})
+
+
 @skip_if_mysql
 class ModelTaggedQuerysetOptionsSingleTest(TagTestManager, TestCase):
     """
@@ -9,14 +9,16 @@ Modules tested:
     tagulous.models.models.TagModelQuerySet
 """
 from string import punctuation
+from unittest import mock
 
-from django.db import IntegrityError
+from django.db import IntegrityError, connection
 from django.test import TestCase
 
 import tagulous.settings as tagulous_settings
 from tagulous import models as tag_models
+from tagulous.models import counts
 from tagulous.settings import SLUG_TRUNCATE_UNIQUE
-from tests.lib import TagTestManager
+from tests.lib import TagTestManager, skip_if_mysql
 from tests.tagulous_tests_app import models as test_models
 
 
@@ -333,6 +335,28 @@ class TagModelTest(TagTestManager, TestCase):
         self.assertEqual(tag1.count, 1)
         self.assertEqual(tag2.count, 2)
 
+    def test_increment_queries(self):
+        "Increment uses UPDATE ... RETURNING where the database supports it"
+        tag1 = self.create(self.tag_model, name="blue")
+        returning = counts.can_update_returning(connection)
+        with self.assertNumQueries(1 if returning else 2):
+            tag1.increment()
+        self.assertInstanceEqual(tag1, count=1)
+        self.assertEqual(tag1.count, 1)
+
+    def test_increment_no_returning(self):
+        "Increment reloads the count where UPDATE ... RETURNING is not supported"
+        tag1 = self.create(self.tag_model, name="blue", count=1)
+        old_can_update_returning = counts.can_update_returning
+        counts.can_update_returning = lambda connection: False
+        try:
+            with self.assertNumQueries(2):
+                tag1.increment()
+        finally:
+            counts.can_update_returning = old_can_update_returning
+        self.assertInstanceEqual(tag1, count=2)
+        self.assertEqual(tag1.count, 2)
+
     def test_decrement(self):
         tag1 = self.create(self.tag_model, name="blue", count=2)
         self.assertTagModel(self.tag_model, {"blue": 2})
@@ -394,6 +418,40 @@ class TagModelTest(TagTestManager, TestCase):
         t1.delete()
         self.assertTagModel(self.tag_model, {})
 
+    def test_get_related_count(self):
+        "Check related tag fields are counted"
+        self.create(self.model1, name="Test 1", singletag="blue", tags="blue, red")
+        self.create(self.model2, name="Test 2", singletag="blue", tags="blue")
+        blue = self.tag_model.objects.get(name="blue")
+        t3 = self.create(self.model_nontag, name="Test 3", fk=blue, mm=[blue])
+        self.assertInstanceEqual(t3, name="Test 3", fk=blue, mm=[blue])
+
+        # One count query per field
+        with self.assertNumQueries(4):
+            self.assertEqual(blue.get_related_count(), 4)
+        self.assertEqual(blue.get_related_count(include_standard=True), 6)
+
+    def test_has_related(self):
+        "Check related fields are checked for references"
+        blue = self.create(self.tag_model, name="blue")
+        red = self.create(self.tag_model, name="red")
+        self.assertFalse(blue.has_related(include_standard=True))
+
+        self.create(self.model_nontag, name="Test 1", fk=red, mm=[blue])
+        self.assertFalse(blue.has_related())
+        self.assertTrue(blue.has_related(include_standard=True))
+        self.assertTrue(red.has_related(include_standard=True))
+
+    def test_update_count_queries(self):
+        "Check the number of queries doesn't depend on how often a tag is used"
+        for i in range(10):
+            self.create(self.model1, name="Test %d" % i, singletag="blue", tags="blue")
+        blue = self.tag_model.objects.get(name="blue")
+        # Four count queries and the save
+        with self.assertNumQueries(5):
+            blue.update_count()
+        self.assertTagModel(self.tag_model, {"blue": 20})
+
     def test_slug_set(self):
         "Check the slug field is set correctly"
         t1a = self.tag_model.objects.create(name="One and Two!")
@@ -443,6 +501,60 @@ class TagModelTest(TagTestManager, TestCase):
         for i in range(1, num_clashes):
             self.assertEqual(tests[i].slug, f"one-and-two_{i}")
 
+    def test_slug_clash_numeric_max(self):
+        "Check slug clash numbers are compared as numbers, ignoring other slugs"
+        self.tag_model.objects.create(name="one_9")
+        self.tag_model.objects.create(name="one_10")
+        self.tag_model.objects.create(name="one_two")
+        self.tag_model.objects.create(name="one")
+        t1 = self.tag_model.objects.create(name="One!")
+        self.assertEqual(t1.slug, "one_11")
+
+    def test_slug_clash_numeric_overflow(self):
+        "Check slug numbers too large for the database are ignored"
+        self.tag_model.objects.create(name="one_99999999999999999999")
+        self.tag_model.objects.create(name="one_3")
+        self.tag_model.objects.create(name="one")
+        t1 = self.tag_model.objects.create(name="One!")
+        self.assertEqual(t1.slug, "one_4")
+
+    def test_slug_queries(self):
+        "Check slugs are found without trying to save first"
+        # One query to find the slug, then the insert in a savepoint
+        with self.assertNumQueries(4):
+            self.tag_model.objects.create(name="one")
+        # Slug clash adds one query to find the next number
+        with self.assertNumQueries(5):
+            t1 = self.tag_model.objects.create(name="One!")
+        self.assertEqual(t1.slug, "one_1")
+
+    def test_slug_race(self):
+        "Check the slug is found again if it is taken while saving"
+        self.tag_model.objects.create(name="one")
+        set_slugs = tag_models.TagModelQuerySet._set_slugs
+        calls = []
+
+        def stale_set_slugs(qs, tags):
+            # Pretend another process took the slug after it was found
+            calls.append(tags)
+            set_slugs(qs, tags)
+            if len(calls) == 1:
+                tags[0].slug = "one"
+
+        with mock.patch.object(
+            tag_models.TagModelQuerySet, "_set_slugs", stale_set_slugs
+        ):
+            t1 = self.tag_model.objects.create(name="One!")
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(t1.slug, "one_1")
+
+    def test_slug_rebuild(self):
+        "Check a saved tag can rebuild its slug without clashing with itself"
+        t1 = self.tag_model.objects.create(name="one")
+        t1.slug = None
+        t1.save()
+        self.assertEqual(t1.slug, "one")
+
     def test_tag_model_factory(self):
         "Check the tag model factory supports setting max lengths"
         TestModel = test_models.TagSlugShorterModel
@@ -844,6 +956,129 @@ class TagModelQuerySetTest(TagTestManager, TestCase):
         self.assertEqual(filtered[3], "David")
         self.assertEqual(filtered[4], "Eric")
 
+    def test_filter_names(self):
+        filtered = self.tag_model.objects.filter_names(["eric", "FRANK", "Gary"])
+        self.assertEqual(len(filtered), 2)
+        self.assertEqual(filtered[0], "Eric")
+        self.assertEqual(filtered[1], "Frank")
+
+    @skip_if_mysql
+    def test_filter_names_case_sensitive(self):
+        # "Adam" is an initial tag
+        tag_model = self.model.case_sensitive_true.tag_model
+        tag_model.objects.create(name="adam")
+        filtered = tag_model.objects.filter_names(["adam", "Brian"])
+        self.assertEqual(len(filtered), 1)
+        self.assertEqual(filtered[0].name, "adam")
+
+    def test_filter_names_non_ascii(self):
+        "Check non-ASCII names are found on databases which only lower ASCII"
+        self.tag_model.objects.create(name="Éric")
+        filtered = self.tag_model.objects.filter_names(["Éric", "eric"])
+        self.assertEqual(sorted(tag.name for tag in filtered), ["Eric", "Éric"])
+
+        # Assigning the name finds the existing tag
+        self.o1.initial_list = "Éric"
+        self.assertEqual(
+            [tag.pk for tag in self.o1.initial_list.tags],
+            [self.tag_model.objects.get(name="Éric").pk],
+        )
+
+    def test_filter_names_empty(self):
+        filtered = self.tag_model.objects.filter_names([])
+        self.assertEqual(len(filtered), 0)
+
+    def test_change_counts(self):
+        david = self.tag_model.objects.get(name="David")
+        eric = self.tag_model.objects.get(name="Eric")
+        frank = self.tag_model.objects.get(name="Frank")
+        # Update, then reload unless the update returns the new counts
+        returning = counts.can_update_returning(connection)
+        with self.assertNumQueries(1 if returning else 2):
+            self.tag_model.objects.change_counts({david: 2, eric: -1, frank: 1})
+        self.assertEqual(david.count, 3)
+        self.assertEqual(eric.count, 1)
+        self.assertEqual(frank.count, 2)
+
+        # Tags no longer in use are deleted
+        gary = self.tag_model.objects.create(name="Gary", count=1)
+        self.tag_model.objects.change_counts({eric: 3, gary: -1})
+        self.assertEqual(eric.count, 4)
+        self.assertEqual(gary.count, 0)
+        self.assertTagModel(
+            self.model.initial_list,
+            {"Adam": 0, "Brian": 0, "Chris": 0, "David": 3, "Eric": 4, "Frank": 2},
+        )
+
+    def test_bulk_get_or_create(self):
+        with self.assertNumQueries(4):
+            tags = self.tag_model.objects.bulk_get_or_create(
+                ["eric", "Frank", "Gary", "Harry"], protected=True
+            )
+        self.assertEqual(list(tags.keys()), ["eric", "Frank", "Gary", "Harry"])
+        self.assertEqual(tags["eric"].name, "Eric")
+        self.assertFalse(tags["eric"].protected)
+        self.assertEqual(tags["Gary"].slug, "gary")
+        self.assertTrue(tags["Gary"].protected)
+        self.assertEqual(tags["Harry"].count, 0)
+        self.assertTagModel(
+            self.model.initial_list,
+            {
+                "Adam": 0,
+                "Brian": 0,
+                "Chris": 0,
+                "David": 1,
+                "Eric": 2,
+                "Frank": 1,
+                "Gary": 0,
+                "Harry": 0,
+            },
+        )
+
+    def test_bulk_get_or_create_empty(self):
+        with self.assertNumQueries(0):
+            self.assertEqual(self.tag_model.objects.bulk_get_or_create([]), {})
+
+    def test_bulk_get_or_create_slug_clash(self):
+        tags = self.tag_model.objects.bulk_get_or_create(
+            ["Frank!", "Gary Lee", "Gary-Lee", "Gary lee!"]
+        )
+        self.assertEqual(tags["Frank!"].slug, "frank_1")
+        self.assertEqual(tags["Gary Lee"].slug, "gary-lee")
+        self.assertEqual(tags["Gary-Lee"].slug, "gary-lee_1")
+        self.assertEqual(tags["Gary lee!"].slug, "gary-lee_2")
+
+    def test_bulk_get_or_create_slug_clash_new_number(self):
+        "Check numbers for clashes include numbered slugs in the same batch"
+        tags = self.tag_model.objects.bulk_get_or_create(["Gary_1", "Gary", "Gary!"])
+        self.assertEqual(tags["Gary_1"].slug, "gary_1")
+        self.assertEqual(tags["Gary"].slug, "gary")
+        self.assertEqual(tags["Gary!"].slug, "gary_2")
+
+    def test_delete_unused(self):
+        self.tag_model.objects.create(name="Gary")
+        self.tag_model.objects.create(name="Harry", protected=True)
+        self.assertEqual(self.tag_model.objects.delete_unused(), 1)
+        self.assertTagModel(
+            self.model.initial_list,
+            {
+                "Adam": 0,
+                "Brian": 0,
+                "Chris": 0,
+                "David": 1,
+                "Eric": 2,
+                "Frank": 1,
+                "Harry": 0,
+            },
+        )
+
+    def test_delete_unused_referenced(self):
+        "Check a tag with a count of 0 is not deleted if something refers to it"
+        eric = self.tag_model.objects.get(name="Eric")
+        eric.count = 0
+        eric.save()
+        self.assertEqual(self.tag_model.objects.delete_unused(), 0)
+
     def test_weight_scale_up(self):
         "Test weight() scales up to max"
         # Scale them to 2+2n: 0=2, 1=4, 2=6
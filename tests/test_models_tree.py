@@ -834,6 +834,63 @@ class TagTreeQuerySetTest(TagTreeTestManager, TestCase):
             ],
         )
 
+    def test_bulk_get_or_create(self):
+        "Check bulk get or create finds existing tags and creates ancestors"
+        tags = self.tag_model.objects.bulk_get_or_create(
+            ["Animal/Mammal/Cat", "Animal/Reptile/Snake", "Mineral"], protected=True
+        )
+        self.assertEqual(len(tags), 3)
+        self.assertEqual(tags["Animal/Mammal/Cat"].pk, self.cat.pk)
+        self.assertFalse(tags["Animal/Mammal/Cat"].protected)
+
+        snake = tags["Animal/Reptile/Snake"]
+        reptile = self.tag_model.objects.get(name="Animal/Reptile")
+        self.assertTreeTag(
+            snake,
+            label="Snake",
+            slug="snake",
+            path="animal/reptile/snake",
+            parent=reptile,
+            protected=True,
+            level=3,
+        )
+        self.assertTreeTag(
+            reptile,
+            label="Reptile",
+            path="animal/reptile",
+            parent=self.tag_model.objects.get(name="Animal"),
+            protected=False,
+            level=2,
+        )
+        self.assertTreeTag(tags["Mineral"], path="mineral", protected=True, level=1)
+
+    def test_bulk_get_or_create_queries(self):
+        "Check bulk get or create only needs a few queries per level"
+        with self.assertNumQueries(12):
+            self.tag_model.objects.bulk_get_or_create(
+                ["Mineral/Rock/Granite", "Mineral/Rock/Slate", "Mineral/Gem/Ruby"]
+            )
+        self.assertEqual(self.tag_model.objects.filter(name__startswith="M").count(), 6)
+
+    def test_delete_unused(self):
+        "Check deleting unused tags also deletes parents which become unused"
+        qs = self.tag_model.objects.filter(name__in=["Animal/Mammal/Cat", "Vegetable"])
+        self.assertEqual(qs.delete_unused(), 2)
+        self.assertEqual(
+            self.tag_model.objects.filter(name="Animal/Mammal/Dog").delete_unused(), 2
+        )
+        self.assertTagModel(
+            self.tag_model,
+            {"Animal": 0, "Animal/Insect": 0, "Animal/Insect/Bee": 0},
+        )
+
+    def test_save_creates_ancestors(self):
+        "Check saving a tag creates its missing ancestors"
+        rock_salt = self.tag_model.objects.create(name="Mineral/Salt/Rock Salt")
+        salt = rock_salt.parent
+        self.assertTreeTag(salt, name="Mineral/Salt", path="mineral/salt", level=2)
+        self.assertTreeTag(salt.parent, name="Mineral", path="mineral", level=1)
+
 
 # ##############################################################################
 # ###### TagTreeModel access via fields
@@ -126,3 +126,41 @@ class TagOptionsTest(TestCase):
         self.assertNotEqual(id(opt1), id(opt2))
         self.assertNotEqual(id(opt2), id(opt3))
         self.assertNotEqual(id(opt3), id(opt1))
+
+    def test_normaliser_defaults(self):
+        normaliser = tag_models.TagOptions().normaliser
+        self.assertEqual(normaliser.normalise("Adam"), "Adam")
+        self.assertEqual(normaliser.key("Adam"), "adam")
+        self.assertEqual(normaliser.lookup, "name__iexact")
+        self.assertEqual(normaliser.name_lookup("startswith"), "name__istartswith")
+
+    def test_normaliser_case_sensitive(self):
+        normaliser = tag_models.TagOptions(case_sensitive=True).normaliser
+        self.assertEqual(normaliser.normalise("Adam"), "Adam")
+        self.assertEqual(normaliser.key("Adam"), "Adam")
+        self.assertEqual(normaliser.lookup, "name")
+        self.assertEqual(normaliser.name_lookup("startswith"), "name__startswith")
+
+    def test_normaliser_force_lowercase(self):
+        normaliser = tag_models.TagOptions(
+            force_lowercase=True, case_sensitive=True
+        ).normaliser
+        self.assertEqual(normaliser.normalise("Adam"), "adam")
+        self.assertEqual(normaliser.key("Adam"), "adam")
+        self.assertEqual(normaliser.lookup, "name")
+
+    def test_normaliser_cached(self):
+        opt = tag_models.TagOptions()
+        self.assertIs(opt.normaliser, opt.normaliser)
+        self.assertEqual(opt.items(with_defaults=False), {})
+
+    def test_normaliser_rebuilt_on_change(self):
+        opt = tag_models.TagOptions()
+        normaliser = opt.normaliser
+        opt.initial = "Adam"
+        self.assertIs(opt.normaliser, normaliser)
+        opt.case_sensitive = True
+        self.assertIsNot(opt.normaliser, normaliser)
+        self.assertEqual(opt.normaliser.lookup, "name")
+        opt.update({"force_lowercase": True})
+        self.assertEqual(opt.normaliser.normalise("Adam"), "adam")
@@ -5,8 +5,14 @@ Tagulous test: Utils
 Modules tested:
     tagulous.utils
 """
+import os
+import subprocess
+import sys
+from unittest import mock
+
 from django.test import TestCase
 
+from tagulous import settings as tagulous_settings
 from tagulous import utils as tag_utils
 
 
@@ -219,6 +225,161 @@ class UtilsParseTagsTest(TestCase):
         self.assertEqual(tags[0], "adam")
         self.assertEqual(tags[1], "brian chris")
 
+    def test_quotes_long_string(self):
+        "Long quoted strings are parsed in a single pass"
+        tag_string = ", ".join('"tag, %d"' % i for i in range(20000))
+        tags = tag_utils.parse_tags(tag_string)
+        self.assertEqual(len(tags), 20000)
+        self.assertEqual(tags[0], "tag, 0")
+        self.assertEqual(tags[-1], "tag, 9999")
+
+    def test_quotes_long_tag(self):
+        tags = tag_utils.parse_tags('"%s"' % ("a, " * 50000))
+        self.assertEqual(len(tags), 1)
+        self.assertEqual(tags[0], "a, " * 50000)
+
+    def test_quotes_long_escaped(self):
+        tags = tag_utils.parse_tags('adam, "b%sc"' % ('""' * 50000))
+        self.assertEqual(len(tags), 2)
+        self.assertEqual(tags[0], "adam")
+        self.assertEqual(tags[1], "b%sc" % ('"' * 50000))
+
+    def test_limit_stops_parsing(self):
+        "Parsing stops as soon as there are too many unique tags"
+        seen = []
+        iter_tags = tag_utils.iter_tags
+
+        def counting_iter_tags(*args):
+            for tag in iter_tags(*args):
+                seen.append(tag)
+                yield tag
+
+        tag_string = ", ".join('"tag %d"' % i for i in range(10000))
+        with mock.patch.object(tag_utils, "iter_tags", counting_iter_tags):
+            with self.assertRaises(ValueError):
+                tag_utils.parse_tags(tag_string, 3)
+        self.assertEqual(len(seen), 4)
+
+    def test_limit_stops_parsing_quoted_commas(self):
+        "Parsing stops early when space delimited tags contain quoted commas"
+        read = []
+
+        class ReadTrackingStr(str):
+            def __getitem__(self, key):
+                if isinstance(key, int):
+                    read.append(key)
+                return super().__getitem__(key)
+
+        tag_string = ReadTrackingStr(" ".join('"tag, %d"' % i for i in range(10000)))
+        with self.assertRaises(ValueError):
+            tag_utils.parse_tags(tag_string, 3)
+        self.assertLess(max(read), 100)
+
+    def test_limit_duplicates_ignored(self):
+        tags = tag_utils.parse_tags('adam, "adam", brian, adam, brian', 2)
+        self.assertEqual(tags, ["adam", "brian"])
+
+
+# ##############################################################################
+# ###### utils.iter_tags
+# ##############################################################################
+
+
+class UtilsIterTagsTest(TestCase):
+    "Test utils.iter_tags"
+
+    def test_empty(self):
+        self.assertEqual(list(tag_utils.iter_tags("")), [])
+        self.assertEqual(list(tag_utils.iter_tags(None)), [])
+
+    def test_order_and_duplicates(self):
+        tags = list(tag_utils.iter_tags("chris, adam, chris"))
+        self.assertEqual(tags, ["chris", "adam", "chris"])
+
+    def test_quotes_order_and_duplicates(self):
+        tags = list(tag_utils.iter_tags('chris, "adam", chris'))
+        self.assertEqual(tags, ["chris", "adam", "chris"])
+
+    def test_lazy(self):
+        tags = tag_utils.iter_tags('"adam, one", brian, chris')
+        self.assertEqual(next(tags), "adam, one")
+        self.assertEqual(next(tags), "brian")
+
+    def test_lazy_unquoted(self):
+        tags = tag_utils.iter_tags("adam brian chris")
+        self.assertEqual(next(tags), "adam")
+
+    def test_spaces_held_for_late_comma(self):
+        "Space delimited tags are not yielded until the delimiter is known"
+        tags = list(tag_utils.iter_tags('"adam" brian, chris'))
+        self.assertEqual(tags, ['adam" brian', "chris"])
+
+    def test_spaces_after_last_comma(self):
+        tags = list(tag_utils.iter_tags('"adam, one" brian chris'))
+        self.assertEqual(tags, ["adam, one", "brian", "chris"])
+
+    def test_spaces_quoted_commas_lazy(self):
+        "Space delimited tags are yielded if every later comma is quoted"
+        tags = tag_utils.iter_tags('adam "brian, one" "chris ""two"", three"')
+        self.assertEqual(next(tags), "adam")
+        self.assertEqual(list(tags), ["brian, one", 'chris "two", three'])
+
+    def test_spaces_quote_closed_by_comma(self):
+        "A quote closed by a comma still changes the delimiter"
+        tags = list(tag_utils.iter_tags('adam "brian ",chris" dave'))
+        self.assertEqual(tags, ['adam "brian "', 'chris" dave'])
+
+    def test_spaces_false(self):
+        tags = list(tag_utils.iter_tags("adam brian, chris", space_delimiter=False))
+        self.assertEqual(tags, ["adam brian", "chris"])
+
+
+# ##############################################################################
+# ###### utils.parse_tags_many
+# ##############################################################################
+
+
+class UtilsParseTagsManyTest(TestCase):
+    "Test utils.parse_tags_many"
+
+    def test_empty(self):
+        parsed, names = tag_utils.parse_tags_many([])
+        self.assertEqual(parsed, [])
+        self.assertEqual(names, set())
+
+    def test_parsed_in_order(self):
+        parsed, names = tag_utils.parse_tags_many(
+            ["chris, adam", "", '"brian, dave" ed', "adam"]
+        )
+        self.assertEqual(
+            parsed, [["adam", "chris"], [], ["brian, dave", "ed"], ["adam"]]
+        )
+        self.assertEqual(names, {"adam", "brian, dave", "chris", "ed"})
+
+    def test_repeated_strings_independent(self):
+        parsed, names = tag_utils.parse_tags_many(["adam, brian", "adam, brian"])
+        self.assertEqual(parsed, [["adam", "brian"], ["adam", "brian"]])
+        self.assertIsNot(parsed[0], parsed[1])
+        self.assertEqual(names, {"adam", "brian"})
+
+    def test_generator(self):
+        parsed, names = tag_utils.parse_tags_many("adam %d" % i for i in range(3))
+        self.assertEqual(parsed, [["0", "adam"], ["1", "adam"], ["2", "adam"]])
+        self.assertEqual(names, {"adam", "0", "1", "2"})
+
+    def test_space_delimiter(self):
+        parsed, names = tag_utils.parse_tags_many(
+            ["adam brian", "chris"], space_delimiter=False
+        )
+        self.assertEqual(parsed, [["adam brian"], ["chris"]])
+        self.assertEqual(names, {"adam brian", "chris"})
+
+    def test_limit(self):
+        with self.assertRaises(ValueError) as cm:
+            tag_utils.parse_tags_many(["adam", "adam,brian,chris"], 2)
+        e = cm.exception
+        self.assertEqual(str(e), "This field can only have 2 arguments")
+
 
 # ##############################################################################
 # ###### utils.render_tags
@@ -261,6 +422,108 @@ class UtilsRenderTagsTest(TestCase):
         self.assertEqual(tagstr, tagstr2)
 
 
+# ##############################################################################
+# ###### utils parse and render caches
+# ##############################################################################
+
+
+class UtilsCacheTest(TestCase):
+    "Test the parse_tags and render_tags LRU caches"
+
+    def setUp(self):
+        tag_utils.configure_caches(size=2, max_length=20)
+
+    def tearDown(self):
+        tag_utils.configure_caches()
+
+    def test_disabled(self):
+        tag_utils.configure_caches(size=0)
+        self.assertEqual(
+            tag_utils.cache_info(), {"parse_tags": None, "render_tags": None}
+        )
+        self.assertEqual(tag_utils.parse_tags("adam, brian"), ["adam", "brian"])
+        tag_utils.cache_clear()
+
+    def test_parse_hits_and_misses(self):
+        tag_utils.parse_tags("adam, brian")
+        tag_utils.parse_tags("adam, brian")
+        tag_utils.parse_tags("adam, brian", space_delimiter=False)
+        info = tag_utils.cache_info()["parse_tags"]
+        self.assertEqual(info.hits, 1)
+        self.assertEqual(info.misses, 2)
+        self.assertEqual(info.maxsize, 2)
+        self.assertEqual(info.currsize, 2)
+
+    def test_parse_bounded(self):
+        for i in range(5):
+            tag_utils.parse_tags("adam %d" % i)
+        info = tag_utils.cache_info()["parse_tags"]
+        self.assertEqual(info.misses, 5)
+        self.assertEqual(info.currsize, 2)
+
+    def test_parse_result_not_shared(self):
+        tags = tag_utils.parse_tags("adam, brian")
+        tags.append("chris")
+        self.assertEqual(tag_utils.parse_tags("adam, brian"), ["adam", "brian"])
+
+    def test_parse_limit_uses_cache(self):
+        tag_utils.parse_tags("adam, brian, chris")
+        with self.assertRaises(ValueError) as cm:
+            tag_utils.parse_tags("adam, brian, chris", 2)
+        e = cm.exception
+        self.assertEqual(str(e), "This field can only have 2 arguments")
+        self.assertEqual(tag_utils.cache_info()["parse_tags"].hits, 1)
+
+    def test_parse_long_string_not_cached(self):
+        tags = tag_utils.parse_tags("adam, brian, chris, dave, ed")
+        self.assertEqual(len(tags), 5)
+        info = tag_utils.cache_info()["parse_tags"]
+        self.assertEqual(info.misses, 0)
+        self.assertEqual(info.currsize, 0)
+
+    def test_render_hits_and_misses(self):
+        self.assertEqual(tag_utils.render_tags(["brian", "adam"]), "adam, brian")
+        self.assertEqual(tag_utils.render_tags(("brian", "adam")), "adam, brian")
+        info = tag_utils.cache_info()["render_tags"]
+        self.assertEqual(info.hits, 1)
+        self.assertEqual(info.misses, 1)
+
+    def test_render_long_names_not_cached(self):
+        tag_utils.render_tags(["adam", "brian", "chris", "dave", "ed", "frank"])
+        self.assertEqual(tag_utils.cache_info()["render_tags"].currsize, 0)
+
+    def test_configured_on_first_use(self):
+        tag_utils._caches_configured = False
+        with mock.patch.object(tagulous_settings, "PARSE_CACHE_SIZE", 3):
+            tag_utils.parse_tags("adam")
+        info = tag_utils.cache_info()["parse_tags"]
+        self.assertEqual(info.maxsize, 3)
+        self.assertEqual(info.misses, 1)
+
+    def test_import_without_settings(self):
+        "Check the parser can be used without Django settings configured"
+        env = dict(os.environ)
+        env.pop("DJANGO_SETTINGS_MODULE", None)
+        code = (
+            "from tagulous import utils; "
+            "print(utils.render_tags(utils.parse_tags('adam, brian chris')))"
+        )
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        output = subprocess.check_output(
+            [sys.executable, "-c", code], cwd=root, env=env, text=True
+        )
+        self.assertEqual(output.strip(), '"brian chris", adam')
+
+    def test_cache_clear(self):
+        tag_utils.parse_tags("adam")
+        tag_utils.render_tags(["adam"])
+        tag_utils.cache_clear()
+        info = tag_utils.cache_info()
+        self.assertEqual(info["parse_tags"].misses, 0)
+        self.assertEqual(info["parse_tags"].currsize, 0)
+        self.assertEqual(info["render_tags"].currsize, 0)
+
+
 # ##############################################################################
 # ###### Tree name split and join
 # ##############################################################################